@@ -2,11 +2,35 @@
 # This module handles loading and managing environment variables
 
 import os
+from typing import Callable, TypeVar
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
 load_dotenv()
 
+T = TypeVar("T")
+
+
+def _env(name: str, default: T, cast: Callable[[str], T]) -> T:
+    """
+    Read an environment variable and coerce it to the given type
+    
+    Args:
+        name: Environment variable name
+        default: Value used when the variable is unset or empty
+        cast: Conversion applied to the raw string (e.g. int, float)
+        
+    Returns:
+        The coerced value, or the default
+    """
+    raw = os.getenv(name)
+    if raw is None or raw.strip() == "":
+        return default
+    try:
+        return cast(raw)
+    except ValueError:
+        raise ValueError(f"Invalid value for {name}: {raw!r}") from None
+
 class Config:
     """Configuration class for Code Graph application"""
     
@@ -14,38 +38,91 @@ class Config:
     NEO4J_URI = os.getenv("NEO4J_URI", "neo4j://localhost:7687")
     NEO4J_USERNAME = os.getenv("NEO4J_USERNAME", "neo4j")
     NEO4J_PASSWORD = os.getenv("NEO4J_PASSWORD", "password")
+    NEO4J_DATABASE = os.getenv("NEO4J_DATABASE", "neo4j")
+    
+    # Neo4j Driver Connection Pool
+    NEO4J_MAX_POOL_SIZE = _env("NEO4J_MAX_POOL_SIZE", 50, int)
+    NEO4J_CONN_ACQUISITION_TIMEOUT = _env("NEO4J_CONN_ACQUISITION_TIMEOUT", 60.0, float)
+    NEO4J_MAX_CONN_LIFETIME = _env("NEO4J_MAX_CONN_LIFETIME", 3600.0, float)
+    NEO4J_POOL_WARMUP_SIZE = _env("NEO4J_POOL_WARMUP_SIZE", 0, int)
+    NEO4J_CONNECTION_TIMEOUT = _env("NEO4J_CONNECTION_TIMEOUT", 20.0, float)
     
     # OpenAI Configuration
     OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
     
     # Application Configuration
-    CHUNK_SIZE = int(os.getenv("CHUNK_SIZE", "500"))
-    CHUNK_OVERLAP = int(os.getenv("CHUNK_OVERLAP", "50"))
+    CHUNK_SIZE = _env("CHUNK_SIZE", 500, int)
+    CHUNK_OVERLAP = _env("CHUNK_OVERLAP", 50, int)
     EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "text-embedding-3-large")
+    EMBEDDING_BATCH_SIZE = _env("EMBEDDING_BATCH_SIZE", 256, int)
+    EMBEDDING_MAX_CONCURRENCY = _env("EMBEDDING_MAX_CONCURRENCY", 8, int)
+    # SQLite file caching embeddings by content hash; set to an empty string to disable
+    EMBEDDING_CACHE_PATH = os.getenv(
+        "EMBEDDING_CACHE_PATH",
+        os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "embedding_cache", "embeddings.sqlite3")
+    )
     LLM_MODEL = os.getenv("LLM_MODEL", "gpt-4o")
+    # Building the GraphRAG system runs entity extraction and embedding at the
+    # same time, so up to LLM_MAX_CONCURRENCY + EMBEDDING_MAX_CONCURRENCY
+    # OpenAI requests share the API key's rate limits
+    LLM_MAX_CONCURRENCY = _env("LLM_MAX_CONCURRENCY", 8, int)
+    
+    # Environment variables that must be set for the application to run
+    REQUIRED_VARS = ("OPENAI_API_KEY", "NEO4J_URI", "NEO4J_USERNAME", "NEO4J_PASSWORD")
     
     @classmethod
     def validate_config(cls) -> bool:
         """
         Validate that all required configuration is present
         
+        Stops at the first missing variable, so the happy path builds no list.
+        
         Returns:
             bool: True if all required config is present, False otherwise
         """
-        required_vars = [
-            cls.OPENAI_API_KEY,
-            cls.NEO4J_URI,
-            cls.NEO4J_USERNAME,
-            cls.NEO4J_PASSWORD
-        ]
-        
-        missing_vars = [var for var in required_vars if not var]
+        first_missing = next((name for name in cls.REQUIRED_VARS if not getattr(cls, name)), None)
         
-        if missing_vars:
-            print(f"Missing required environment variables: {missing_vars}")
+        if first_missing:
+            print(f"Missing required environment variable: {first_missing}")
             return False
         
         return True
 
+# Catch inconsistent chunking settings at startup rather than inside the text splitter
+if not 0 <= Config.CHUNK_OVERLAP < Config.CHUNK_SIZE:
+    raise ValueError(
+        f"CHUNK_OVERLAP ({Config.CHUNK_OVERLAP}) must be non-negative and smaller "
+        f"than CHUNK_SIZE ({Config.CHUNK_SIZE})"
+    )
+
+# The OpenAI embeddings endpoint accepts at most 2048 inputs per request
+if not 1 <= Config.EMBEDDING_BATCH_SIZE <= 2048:
+    raise ValueError(
+        f"EMBEDDING_BATCH_SIZE ({Config.EMBEDDING_BATCH_SIZE}) must be between 1 and 2048"
+    )
+
+if Config.EMBEDDING_MAX_CONCURRENCY < 1:
+    raise ValueError(
+        f"EMBEDDING_MAX_CONCURRENCY ({Config.EMBEDDING_MAX_CONCURRENCY}) must be at least 1"
+    )
+
+if Config.LLM_MAX_CONCURRENCY < 1:
+    raise ValueError(
+        f"LLM_MAX_CONCURRENCY ({Config.LLM_MAX_CONCURRENCY}) must be at least 1"
+    )
+
 # Create a global config instance
-config = Config() 
\ No newline at end of file
+config = Config()
+
+
+def get_config() -> Config:
+    """
+    Get the shared configuration instance
+    
+    Environment variables are read once when this module is imported, so
+    callers should reuse this instance instead of constructing Config().
+    
+    Returns:
+        Config: The global configuration instance
+    """
+    return config
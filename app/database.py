@@ -1,55 +1,63 @@
 """
-Neo4j Database Connection Singleton
+Neo4j Database Connection Manager
 
-This module provides a singleton pattern for managing Neo4j database connections
-across the entire application. It ensures only one connection is maintained
-and provides thread-safe access to the database.
+This module provides the shared Neo4j connection manager used across the
+entire application. get_neo4j_connection() creates it once, even when several
+threads ask for it at the same time; the Neo4j driver it holds is thread-safe,
+while connect() and close() should be called from one thread at a time.
 """
 
+import atexit
 import logging
+import threading
+import time
+from contextlib import ExitStack
+from importlib import metadata
 from typing import Optional, Tuple
-from neo4j import GraphDatabase, Driver
-from threading import Lock
+import neo4j
+from neo4j import GraphDatabase, Driver, Result, RoutingControl
 from .config import Config
+from .utilities.neo4j_utils import create_constraints_and_indexes
 
 logger = logging.getLogger(__name__)
 
+# Seconds a get_database_info() result is reused (Streamlit reruns the sidebar on every interaction)
+DATABASE_INFO_TTL_SECONDS = 5.0
+
 class Neo4jConnection:
     """
-    Singleton class for managing Neo4j database connections
+    Manages the Neo4j driver shared by the whole application
     
-    This class ensures that only one Neo4j connection is maintained
-    throughout the application lifecycle, providing efficient resource
-    management and consistent database access.
+    Use get_neo4j_connection() rather than constructing this class: it
+    creates one instance on first use and returns it to every caller, so only
+    one Neo4j driver is maintained throughout the application lifecycle.
     """
     
-    _instance: Optional['Neo4jConnection'] = None
-    _lock: Lock = Lock()
+    def __init__(self):
+        """Initialize the connection manager"""
+        self.driver: Optional[Driver] = None
+        self.is_connected: bool = False
+        self._indexes_created: bool = False
+        self._apoc_available: Optional[bool] = None
+        self._vector_index_exists: bool = False
+        self._warned_not_connected: bool = False
+        self._database_info_cache: Optional[Tuple[float, dict]] = None
+        logger.info("🔧 Neo4j Connection Manager initialized")
     
-    def __new__(cls) -> 'Neo4jConnection':
+    def _driver_options(self) -> dict:
         """
-        Create or return the singleton instance
+        Build connection pool settings for the driver
         
         Returns:
-            Neo4jConnection: The singleton instance
+            dict: Keyword arguments for GraphDatabase.driver
         """
-        if cls._instance is None:
-            with cls._lock:
-                if cls._instance is None:
-                    cls._instance = super(Neo4jConnection, cls).__new__(cls)
-                    cls._instance._initialized = False
-        return cls._instance
-    
-    def __init__(self):
-        """Initialize the connection manager (only once)"""
-        if hasattr(self, '_initialized') and self._initialized:
-            return
-            
-        self.config = Config()
-        self.driver: Optional[Driver] = None
-        self.is_connected: bool = False
-        self._initialized = True
-        logger.info("🔧 Neo4j Connection Manager initialized")
+        return {
+            'max_connection_pool_size': Config.NEO4J_MAX_POOL_SIZE,
+            'connection_acquisition_timeout': Config.NEO4J_CONN_ACQUISITION_TIMEOUT,
+            'max_connection_lifetime': Config.NEO4J_MAX_CONN_LIFETIME,
+            'connection_timeout': Config.NEO4J_CONNECTION_TIMEOUT,
+            'keep_alive': True
+        }
     
     def connect(self) -> Tuple[bool, str]:
         """
@@ -62,22 +70,26 @@ class Neo4jConnection:
             if self.is_connected and self.driver:
                 return True, "✅ Already connected to Neo4j"
             
-            logger.info(f"🔗 Connecting to Neo4j at {self.config.NEO4J_URI}")
+            logger.info("🔗 Connecting to Neo4j at %s", Config.NEO4J_URI)
             
             # Create driver with authentication
             self.driver = GraphDatabase.driver(
-                self.config.NEO4J_URI,
-                auth=(self.config.NEO4J_USERNAME, self.config.NEO4J_PASSWORD)
+                Config.NEO4J_URI,
+                auth=(Config.NEO4J_USERNAME, Config.NEO4J_PASSWORD),
+                **self._driver_options()
             )
             
-            # Test the connection
-            with self.driver.session() as session:
-                result = session.run("RETURN 1 as test")
-                test_value = result.single()["test"]
-                if test_value != 1:
-                    raise Exception("Connection test failed")
+            # Test the connection; this also fetches the routing table up front
+            server_info = self.driver.get_server_info()
+            logger.info("🗄️ Neo4j server %s (%s)", server_info.agent, server_info.address)
+            self._log_driver_backend()
+            self._warm_connection_pool()
             
             self.is_connected = True
+            self._warned_not_connected = False
+            self._apoc_available = None
+            self._vector_index_exists = False
+            self._database_info_cache = None
             logger.info("✅ Neo4j connection established successfully")
             return True, "✅ Connected to Neo4j successfully"
             
@@ -88,6 +100,67 @@ class Neo4jConnection:
             self.driver = None
             return False, error_msg
     
+    @staticmethod
+    def _log_driver_backend() -> None:
+        """Log the driver version and whether the Rust PackStream extension is active"""
+        try:
+            rust_version = metadata.version("neo4j-rust-ext")
+            logger.info("🦀 Neo4j driver %s with Rust extension %s", neo4j.__version__, rust_version)
+        except metadata.PackageNotFoundError:
+            logger.info("🐍 Neo4j driver %s (pure Python codec; install neo4j-rust-ext for faster serialization)", neo4j.__version__)
+    
+    def _warm_connection_pool(self) -> None:
+        """
+        Open NEO4J_POOL_WARMUP_SIZE pooled connections up front
+        
+        Each connection is held by an open transaction until all are established,
+        so the pool is filled rather than one connection being reused, and the
+        first burst of real queries skips the TCP/TLS handshakes.
+        """
+        warmup_size = min(Config.NEO4J_POOL_WARMUP_SIZE, Config.NEO4J_MAX_POOL_SIZE)
+        if warmup_size <= 0:
+            return
+        
+        with ExitStack() as stack:
+            for _ in range(warmup_size):
+                session = stack.enter_context(self.driver.session(database=Config.NEO4J_DATABASE))
+                tx = stack.enter_context(session.begin_transaction())
+                tx.run("RETURN 1").consume()
+        logger.info("🔥 Warmed %d pooled Neo4j connections", warmup_size)
+    
+    def ensure_schema(self) -> None:
+        """
+        Create constraints and lookup indexes once per process
+        
+        Called by the graph writers before their first write rather than on
+        connect, so query-only sessions never run the DDL or wait for indexes
+        to come online. The vector index is created by
+        GraphBuilder.create_vector_index once there are embeddings to index.
+        All statements are idempotent (IF NOT EXISTS); the flag only avoids
+        repeating the DDL round-trips on reconnects.
+        """
+        if self._indexes_created or not self.driver:
+            return
+        
+        success, message = create_constraints_and_indexes(self.driver)
+        if success:
+            self._indexes_created = True
+        else:
+            logger.warning("⚠️ Schema setup incomplete: %s", message)
+    
+    def _warn_not_connected(self, resource: str) -> None:
+        """
+        Log access while disconnected once per disconnect, then only at debug level
+        
+        Args:
+            resource: What the caller tried to obtain (e.g. "driver", "session")
+        """
+        if self._warned_not_connected:
+            logger.debug("Attempting to get %s when not connected", resource)
+            return
+        self._warned_not_connected = True
+        logger.warning("⚠️ Attempting to get %s when not connected", resource)
+    
     def get_driver(self) -> Optional[Driver]:
         """
         Get the Neo4j driver instance
@@ -96,7 +169,7 @@ class Neo4jConnection:
             Optional[Driver]: The Neo4j driver if connected, None otherwise
         """
         if not self.is_connected or not self.driver:
-            logger.warning("⚠️ Attempting to get driver when not connected")
+            self._warn_not_connected("driver")
             return None
         return self.driver
     
@@ -108,9 +181,9 @@ class Neo4jConnection:
             Neo4j session if connected, None otherwise
         """
         if not self.is_connected or not self.driver:
-            logger.warning("⚠️ Attempting to get session when not connected")
+            self._warn_not_connected("session")
             return None
-        return self.driver.session()
+        return self.driver.session(database=Config.NEO4J_DATABASE)
     
     def test_connection(self) -> Tuple[bool, str]:
         """
@@ -123,13 +196,9 @@ class Neo4jConnection:
             if not self.is_connected or not self.driver:
                 return False, "❌ Not connected to Neo4j"
             
-            with self.driver.session() as session:
-                result = session.run("RETURN 1 as test")
-                test_value = result.single()["test"]
-                if test_value == 1:
-                    return True, "✅ Neo4j connection is healthy"
-                else:
-                    return False, "❌ Connection test failed"
+            # Health check at the pool level without opening a user session
+            self.driver.verify_connectivity()
+            return True, "✅ Neo4j connection is healthy"
                     
         except Exception as e:
             error_msg = f"❌ Connection test failed: {str(e)}"
@@ -138,10 +207,146 @@ class Neo4jConnection:
             self.is_connected = False
             return False, error_msg
     
-    def get_database_info(self) -> Tuple[bool, dict]:
+    def has_apoc(self) -> bool:
+        """
+        Check whether APOC procedures are installed, caching the answer per connection
+        
+        Returns:
+            bool: True if any apoc.* procedure is registered
+        """
+        if self._apoc_available is None:
+            try:
+                apoc_count = self.driver.execute_query(
+                    "SHOW PROCEDURES YIELD name WHERE name STARTS WITH 'apoc.' "
+                    "RETURN count(name) AS apoc_count",
+                    database_=Config.NEO4J_DATABASE,
+                    routing_=RoutingControl.READ,
+                    result_transformer_=Result.single
+                )["apoc_count"]
+                self._apoc_available = apoc_count > 0
+            except Exception as e:
+                logger.debug("APOC probe failed: %s", e)
+                self._apoc_available = False
+        return self._apoc_available
+    
+    def _get_graph_summary(self) -> Tuple[int, int, int, list, list]:
+        """
+        Get node/relationship/CodeChunk counts, labels and relationship types
+        
+        Reads the count store through apoc.meta.stats() when APOC is installed,
+        otherwise falls back to a single Cypher call using subqueries.
+        
+        Returns:
+            Tuple[int, int, int, list, list]: (node_count, rel_count, chunk_count, labels, rel_types)
+        """
+        if self.has_apoc():
+            stats = self.driver.execute_query(
+                "CALL apoc.meta.stats() YIELD nodeCount, relCount, labels, relTypesCount "
+                "RETURN nodeCount, relCount, labels, relTypesCount",
+                database_=Config.NEO4J_DATABASE,
+                routing_=RoutingControl.READ,
+                result_transformer_=Result.single
+            )
+            return (
+                stats["nodeCount"],
+                stats["relCount"],
+                stats["labels"].get("CodeChunk", 0),
+                list(stats["labels"].keys()),
+                list(stats["relTypesCount"].keys())
+            )
+        
+        summary_query = """
+        CALL { MATCH (n) RETURN count(n) AS node_count }
+        CALL { MATCH ()-[r]->() RETURN count(r) AS rel_count }
+        CALL { MATCH (c:CodeChunk) RETURN count(c) AS chunk_count }
+        CALL { CALL db.labels() YIELD label RETURN collect(label) AS labels }
+        CALL { CALL db.relationshipTypes() YIELD relationshipType
+               RETURN collect(relationshipType) AS rel_types }
+        RETURN node_count, rel_count, chunk_count, labels, rel_types
+        """
+        summary = self.driver.execute_query(
+            summary_query,
+            database_=Config.NEO4J_DATABASE,
+            routing_=RoutingControl.READ,
+            result_transformer_=Result.single
+        )
+        return (
+            summary["node_count"],
+            summary["rel_count"],
+            summary["chunk_count"],
+            summary["labels"],
+            summary["rel_types"]
+        )
+    
+    def _get_vector_index_names(self) -> list:
+        """
+        Get the names of all vector indexes, filtered on the server
+        
+        Uses SHOW VECTOR INDEXES (Neo4j 5.11+) and falls back to filtering
+        SHOW INDEXES by type on older servers.
+        
+        Returns:
+            list: Vector index names
+        """
+        def index_names(result: Result) -> list:
+            return result.value("name")
+        
+        try:
+            return self.driver.execute_query(
+                "SHOW VECTOR INDEXES YIELD name",
+                database_=Config.NEO4J_DATABASE,
+                routing_=RoutingControl.READ,
+                result_transformer_=index_names
+            )
+        except Exception:
+            return self.driver.execute_query(
+                "SHOW INDEXES YIELD name, type WHERE type = 'VECTOR' RETURN name",
+                database_=Config.NEO4J_DATABASE,
+                routing_=RoutingControl.READ,
+                result_transformer_=index_names
+            )
+    
+    def _count_code_chunks(self) -> int:
+        """
+        Count CodeChunk nodes (answered from the count store)
+        
+        Returns:
+            int: Number of CodeChunk nodes
+        """
+        return self.driver.execute_query(
+            "MATCH (c:CodeChunk) RETURN count(c) AS chunk_count",
+            database_=Config.NEO4J_DATABASE,
+            routing_=RoutingControl.READ,
+            result_transformer_=Result.single
+        )["chunk_count"]
+    
+    def has_vector_index(self) -> bool:
+        """
+        Check whether the CodeChunk vector index exists and has chunks to search
+        
+        Index existence alone does not mean embeddings were built, so CodeChunk
+        nodes must exist too. A positive index lookup is cached per connection
+        (indexes are not dropped at runtime); a negative one is re-checked so a
+        newly built index is seen. The chunk count is always re-read, since the
+        database can be cleared while connected.
+        
+        Returns:
+            bool: True if code_chunks_vector_index exists and CodeChunk nodes are present
+        """
+        if not self._vector_index_exists:
+            self._vector_index_exists = "code_chunks_vector_index" in self._get_vector_index_names()
+        return self._vector_index_exists and self._count_code_chunks() > 0
+    
+    def get_database_info(self, use_cache: bool = True) -> Tuple[bool, dict]:
         """
         Get database information and statistics
         
+        Successful results are reused for DATABASE_INFO_TTL_SECONDS so repeated
+        UI refreshes don't re-query the server.
+        
+        Args:
+            use_cache: Return a recent cached result if one is available
+        
         Returns:
             Tuple[bool, dict]: (success, database_info)
         """
@@ -149,47 +354,39 @@ class Neo4jConnection:
             if not self.is_connected or not self.driver:
                 return False, {"error": "Not connected to Neo4j"}
             
-            with self.driver.session() as session:
-                # Get node counts
-                node_result = session.run("MATCH (n) RETURN count(n) as node_count")
-                node_count = node_result.single()["node_count"]
-                
-                # Get relationship counts
-                rel_result = session.run("MATCH ()-[r]->() RETURN count(r) as rel_count")
-                rel_count = rel_result.single()["rel_count"]
-                
-                # Get node labels
-                labels_result = session.run("CALL db.labels()")
-                labels = [record["label"] for record in labels_result]
-                
-                # Get relationship types
-                types_result = session.run("CALL db.relationshipTypes()")
-                rel_types = [record["relationshipType"] for record in types_result]
-                
-                # Check for vector index
-                indexes_result = session.run("SHOW INDEXES")
-                vector_indexes = []
-                for record in indexes_result:
-                    if record.get("type") == "VECTOR":
-                        vector_indexes.append(record.get("name"))
-                
-                database_info = {
-                    "connected": True,
-                    "node_count": node_count,
-                    "relationship_count": rel_count,
-                    "node_labels": labels,
-                    "relationship_types": rel_types,
-                    "vector_indexes": vector_indexes,
-                    "has_vector_index": "code_chunks_vector_index" in vector_indexes
-                }
-                
-                return True, database_info
+            cached = self._database_info_cache
+            if use_cache and cached and time.monotonic() - cached[0] < DATABASE_INFO_TTL_SECONDS:
+                return True, dict(cached[1])
+            
+            node_count, rel_count, chunk_count, labels, rel_types = self._get_graph_summary()
+            
+            # Check for vector index (SHOW commands cannot be composed into subqueries)
+            vector_indexes = self._get_vector_index_names()
+            
+            database_info = {
+                "connected": True,
+                "node_count": node_count,
+                "relationship_count": rel_count,
+                "node_labels": labels,
+                "relationship_types": rel_types,
+                "vector_indexes": vector_indexes,
+                # Ready for search only once embedded CodeChunk nodes exist
+                "has_vector_index": "code_chunks_vector_index" in vector_indexes and chunk_count > 0
+            }
+            self._vector_index_exists = "code_chunks_vector_index" in vector_indexes
+            
+            self._database_info_cache = (time.monotonic(), database_info)
+            return True, dict(database_info)
                 
         except Exception as e:
             error_msg = f"Failed to get database info: {str(e)}"
             logger.error(error_msg)
             return False, {"error": error_msg}
     
+    def invalidate_database_info(self) -> None:
+        """Drop the cached get_database_info() result after the graph is modified"""
+        self._database_info_cache = None
+    
     def close(self) -> None:
         """Close the Neo4j connection"""
         try:
@@ -199,24 +396,34 @@ class Neo4jConnection:
                 self.is_connected = False
                 logger.info("🔌 Neo4j connection closed")
         except Exception as e:
-            logger.error(f"Error closing Neo4j connection: {str(e)}")
-    
-    def __del__(self):
-        """Cleanup when object is destroyed"""
-        self.close()
+            logger.error("Error closing Neo4j connection: %s", e)
 
 
-# Global singleton instance
-neo4j_connection = Neo4jConnection()
+# Shared connection manager, created by get_neo4j_connection() on first use
+_connection: Optional[Neo4jConnection] = None
+_connection_lock = threading.Lock()
+
 
 def get_neo4j_connection() -> Neo4jConnection:
     """
-    Get the global Neo4j connection singleton
+    Get the shared Neo4j connection manager
+    
+    The instance is created on first use. Creation is guarded by a lock, so
+    threads racing on first use (e.g. the create_graphrag_system workers)
+    still share a single instance and driver.
     
     Returns:
-        Neo4jConnection: The singleton instance
+        Neo4jConnection: The shared instance
     """
-    return neo4j_connection
+    global _connection
+    if _connection is None:
+        with _connection_lock:
+            if _connection is None:
+                connection = Neo4jConnection()
+                # Close the driver before interpreter teardown rather than relying on __del__ ordering
+                atexit.register(connection.close)
+                _connection = connection
+    return _connection
 
 def initialize_database() -> Tuple[bool, str]:
     """
@@ -1,24 +1,155 @@
 # Code Graph - Knowledge Graph and Embeddings Builder
 # This module handles knowledge graph creation and vector indexing using singleton Neo4j connection
 
+import asyncio
+import hashlib
 import logging
-from typing import Optional, Tuple
+import os
+import sqlite3
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+from typing import Dict, List, Optional, Tuple
 from neo4j import Driver
-from .config import Config
+from .config import get_config
 from .database import get_neo4j_connection
+from .utilities.embedding_cache import get_cached_embeddings, hash_text, store_embeddings
+from .utilities.graph_stats_utils import get_graph_creation_stats, get_graphrag_system_stats
+from .utilities.neo4j_utils import create_code_chunk_vector_index, quote_identifier
+
+try:
+    import ahocorasick  # Optional: multi-pattern matching for bridge relationships
+except ImportError:
+    ahocorasick = None
 
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Maximum number of rows sent in a single UNWIND write statement
+UNWIND_BATCH_SIZE = 1000
+
+# Maximum number of rows committed in one client-side write transaction
+TRANSACTION_BATCH_SIZE = 10_000
+
+# Row count above which graph writes go through apoc.periodic.iterate when available
+BULK_IMPORT_THRESHOLD = 100_000
+BULK_IMPORT_BATCH_SIZE = 10_000
+
+# Concurrent node-write transactions used for bulk imports without APOC
+BULK_WRITE_WORKERS = 4
+
+# Entity labels produced by LLMGraphTransformer
+ENTITY_LABELS = ["File", "Function", "Class", "Module", "Package"]
+
+
+def _assign_chunk_ids(documents: list) -> None:
+    """
+    Give every chunk without a chunk_id a stable content-derived id, in place
+    
+    The id is computed once and stored in the chunk metadata, so the CodeChunk
+    rows and the File links read the same value. blake2b is deterministic
+    across runs, unlike the per-process randomized hash().
+    
+    Args:
+        documents: List of chunked Document objects
+    """
+    for doc in documents:
+        if doc.metadata.get('chunk_id') is None:
+            digest = hashlib.blake2b(doc.page_content.encode('utf-8'), digest_size=8).hexdigest()
+            doc.metadata['chunk_id'] = f"chunk_{digest}"
+
+
+def _batched(rows: list, size: int = TRANSACTION_BATCH_SIZE):
+    """Yield consecutive slices of rows holding at most size rows each"""
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
+
+def _run_unwind_batches(tx, query: str, rows: list) -> int:
+    """
+    Run an UNWIND $rows query in slices of UNWIND_BATCH_SIZE within one transaction
+    
+    Args:
+        tx: Neo4j managed transaction
+        query: Cypher query consuming the $rows parameter
+        rows: Row dictionaries to write
+        
+    Returns:
+        int: Number of relationships created across all slices
+    """
+    relationships_created = 0
+    for start in range(0, len(rows), UNWIND_BATCH_SIZE):
+        summary = tx.run(query, rows=rows[start:start + UNWIND_BATCH_SIZE]).consume()
+        relationships_created += summary.counters.relationships_created
+    return relationships_created
+
+
+def _find_entity_mentions(documents: list, entity_ids: List[str], suffix: str) -> List[dict]:
+    """
+    Pair each chunk with the entities whose id (or id without suffix) appears in its text
+    
+    With pyahocorasick installed, all names are matched in one pass over each
+    chunk (O(text length + hits)) instead of one substring search per entity.
+    
+    Args:
+        documents: Chunked Document objects with chunk_id metadata
+        entity_ids: Entity ids to look for
+        suffix: Suffix also stripped from each id before matching (e.g. "()")
+        
+    Returns:
+        List[dict]: {'chunk_id', 'entity_id'} rows for the bridge UNWIND writes
+    """
+    # Map each searchable name to the entities it identifies; an empty name
+    # would match every chunk, so it is never used as a needle
+    name_to_entities = defaultdict(list)
+    for entity_id in dict.fromkeys(entity_ids):
+        if entity_id:
+            for name in {entity_id, entity_id.replace(suffix, '')} - {''}:
+                name_to_entities[name].append(entity_id)
+    
+    if not name_to_entities:
+        return []
+    
+    entity_order = {entity_id: position for position, entity_id in enumerate(entity_ids)}
+    
+    texts = [doc.page_content for doc in documents]
+    
+    if ahocorasick is not None:
+        automaton = ahocorasick.Automaton()
+        for name, entities in name_to_entities.items():
+            automaton.add_word(name, entities)
+        automaton.make_automaton()
+        
+        hits = [
+            {entity_id for _, entities in automaton.iter(text) for entity_id in entities}
+            for text in texts
+        ]
+    else:
+        hits = [
+            {
+                entity_id
+                for name, entities in name_to_entities.items() if name in text
+                for entity_id in entities
+            }
+            for text in texts
+        ]
+    
+    return [
+        {'chunk_id': doc.metadata['chunk_id'], 'entity_id': entity_id}
+        for doc, mentioned in zip(documents, hits)
+        for entity_id in sorted(mentioned, key=entity_order.get)
+    ]
+
 
 class GraphBuilder:
     """Handles knowledge graph creation and vector indexing in Neo4j"""
     
     def __init__(self):
         """Initialize GraphBuilder with singleton database connection"""
-        self.config = Config()
+        self.config = get_config()
         # Use singleton connection instead of creating our own
         self.connection = get_neo4j_connection()
         
@@ -58,21 +189,25 @@ class GraphBuilder:
             return False, f"❌ Connection validation failed: {str(e)}"
 
     
-    def generate_knowledge_graph(self, documents: list) -> Tuple[bool, str]:
+    def generate_knowledge_graph(self, documents: list, check_connection: bool = True) -> Tuple[bool, str]:
         """
         Generate knowledge graph from code documents using LLMGraphTransformer
         
         Args:
             documents: List of chunked Document objects from parse_code_chunks
+            check_connection: Validate (and if needed re-establish) the connection
+                              first; create_graphrag_system does this once up front
+                              so its worker threads never reconnect concurrently
             
         Returns:
             Tuple[bool, str]: (success, message)
         """
         try:
             # Ensure we have a healthy connection before proceeding
-            connection_success, connection_message = self.ensure_connection()
-            if not connection_success:
-                return False, f"❌ Database connection failed: {connection_message}"
+            if check_connection:
+                connection_success, connection_message = self.ensure_connection()
+                if not connection_success:
+                    return False, f"❌ Database connection failed: {connection_message}"
             
             if not documents:
                 return False, "❌ No documents provided for knowledge graph generation."
@@ -80,45 +215,32 @@ class GraphBuilder:
             logger.info(f"🧠 Starting knowledge graph generation for {len(documents)} documents")
             
             # Import required libraries
-            from langchain_openai import ChatOpenAI
             from langchain_experimental.graph_transformers import LLMGraphTransformer
-            from langchain_neo4j import Neo4jGraph
-            
-            # Initialize OpenAI LLM with configured model
-            llm = ChatOpenAI(
-                model=self.config.LLM_MODEL,
-                temperature=0,  # Deterministic output for consistent entity extraction
-                openai_api_key=self.config.OPENAI_API_KEY
-            )
-            
-            # Initialize Neo4j graph connection
-            neo4j_graph = Neo4jGraph(
-                url=self.config.NEO4J_URI,
-                username=self.config.NEO4J_USERNAME,
-                password=self.config.NEO4J_PASSWORD
-            )
             
             # Configure LLMGraphTransformer with code-specific schema
             graph_transformer = LLMGraphTransformer(
-                llm=llm,
-                allowed_nodes=["File", "Function", "Class", "Module", "Package"],
+                llm=self._create_llm(),
+                allowed_nodes=ENTITY_LABELS,
                 allowed_relationships=["CONTAINS", "CALLS", "IMPORTS", "INHERITS", "IMPLEMENTS", "DEPENDS_ON"],
                 strict_mode=False  # Allow flexible entity extraction
             )
             
             logger.info("🔄 Transforming documents to graph documents...")
             
-            # Transform documents to graph documents
-            graph_documents = graph_transformer.convert_to_graph_documents(documents)
+            # Transform documents to graph documents, one LLM call per document in parallel
+            graph_documents = self._transform_documents(graph_transformer, documents)
             
             if not graph_documents:
                 return False, "❌ No graph documents generated from the provided documents."
             
             logger.info(f"📊 Generated {len(graph_documents)} graph documents")
             
-            # Store graph documents in Neo4j
+            # Store graph documents in Neo4j with batched UNWIND writes
             logger.info("💾 Storing knowledge graph in Neo4j...")
-            neo4j_graph.add_graph_documents(graph_documents)
+            node_groups, rel_groups = self._group_graph_documents(graph_documents)
+            self.connection.ensure_schema()
+            self._store_graph_groups(node_groups, rel_groups)
+            self.connection.invalidate_database_info()
             
             # Get statistics about what was created
             stats_success, stats_message, stats = self._get_stats()
@@ -144,6 +266,195 @@ class GraphBuilder:
             logger.error(error_msg)
             return False, error_msg
     
+    def _transform_documents(self, graph_transformer, documents: list) -> list:
+        """
+        Run LLMGraphTransformer over documents with a bounded number of concurrent LLM calls
+        
+        Concurrency comes from LLM_MAX_CONCURRENCY so it can be tuned to the
+        account's rate limits.
+        
+        Args:
+            graph_transformer: Configured LLMGraphTransformer
+            documents: Documents to transform
+            
+        Returns:
+            list: One GraphDocument per input document, in input order
+        """
+        async def transform_all() -> list:
+            semaphore = asyncio.Semaphore(self.config.LLM_MAX_CONCURRENCY)
+            
+            async def transform(document):
+                async with semaphore:
+                    return await graph_transformer.aprocess_response(document)
+            
+            return await asyncio.gather(*(transform(document) for document in documents))
+        
+        return asyncio.run(transform_all())
+    
+    @staticmethod
+    def _group_graph_documents(graph_documents: list) -> Tuple[Dict[str, list], Dict[tuple, list]]:
+        """
+        Group graph document nodes by label and relationships by (source label, type, target label)
+        
+        Nodes sharing a label and id are merged into a single row so each entity
+        is written once regardless of how many documents mention it.
+        
+        Args:
+            graph_documents: GraphDocument objects from LLMGraphTransformer
+            
+        Returns:
+            Tuple[Dict, Dict]: (node rows keyed by label, relationship rows keyed by pattern)
+        """
+        nodes_by_label: Dict[str, Dict[str, dict]] = defaultdict(dict)
+        rels_by_pattern: Dict[tuple, List[dict]] = defaultdict(list)
+        
+        for graph_document in graph_documents:
+            for node in graph_document.nodes:
+                row = nodes_by_label[node.type].setdefault(node.id, {'id': node.id, 'props': {}})
+                row['props'].update(node.properties or {})
+            
+            for rel in graph_document.relationships:
+                pattern = (rel.source.type, rel.type, rel.target.type)
+                rels_by_pattern[pattern].append({
+                    'src': rel.source.id,
+                    'dst': rel.target.id,
+                    'props': rel.properties or {}
+                })
+        
+        node_groups = {label: list(rows.values()) for label, rows in nodes_by_label.items()}
+        return node_groups, dict(rels_by_pattern)
+    
+    def _store_graph_groups(self, node_groups: Dict[str, list], rel_groups: Dict[tuple, list]) -> None:
+        """
+        Write grouped nodes and relationships without exceeding TRANSACTION_BATCH_SIZE rows per transaction
+        
+        Graphs that fit in one slice commit in a single transaction; larger
+        ones go through apoc.periodic.iterate above BULK_IMPORT_THRESHOLD rows
+        when APOC is installed, and through client-side slices otherwise.
+        
+        Args:
+            node_groups: Node rows keyed by label
+            rel_groups: Relationship rows keyed by (source label, type, target label)
+        """
+        total_rows = sum(map(len, node_groups.values())) + sum(map(len, rel_groups.values()))
+        if total_rows <= TRANSACTION_BATCH_SIZE:
+            with self.driver.session(database=self.config.NEO4J_DATABASE) as session:
+                session.execute_write(self._write_graph_groups, node_groups, rel_groups)
+        elif total_rows > BULK_IMPORT_THRESHOLD and self.connection.has_apoc():
+            logger.info(f"📦 Bulk importing {total_rows} rows with apoc.periodic.iterate")
+            with self.driver.session(database=self.config.NEO4J_DATABASE) as session:
+                self._bulk_write_graph_groups(session, node_groups, rel_groups)
+        else:
+            logger.info(f"📦 Writing {total_rows} rows in {TRANSACTION_BATCH_SIZE}-row transactions")
+            self._batched_write_graph_groups(node_groups, rel_groups)
+    
+    @staticmethod
+    def _write_graph_groups(tx, node_groups: Dict[str, list], rel_groups: Dict[tuple, list]) -> None:
+        """
+        Write grouped nodes and relationships in one transaction using UNWIND batches
+        
+        Args:
+            tx: Neo4j managed transaction
+            node_groups: Node rows keyed by label
+            rel_groups: Relationship rows keyed by (source label, type, target label)
+        """
+        for label, rows in node_groups.items():
+            node_query = (
+                "UNWIND $rows AS row "
+                f"MERGE (n:{quote_identifier(label)} {{id: row.id}}) "
+                "SET n += row.props"
+            )
+            _run_unwind_batches(tx, node_query, rows)
+        
+        for (source_label, rel_type, target_label), rows in rel_groups.items():
+            rel_query = (
+                "UNWIND $rows AS row "
+                f"MERGE (s:{quote_identifier(source_label)} {{id: row.src}}) "
+                f"MERGE (t:{quote_identifier(target_label)} {{id: row.dst}}) "
+                f"MERGE (s)-[r:{quote_identifier(rel_type)}]->(t) "
+                "SET r += row.props"
+            )
+            _run_unwind_batches(tx, rel_query, rows)
+    
+    def _batched_write_graph_groups(self, node_groups: Dict[str, list], rel_groups: Dict[tuple, list]) -> None:
+        """
+        Write grouped nodes and relationships in TRANSACTION_BATCH_SIZE transactions
+        
+        Node slices are committed in parallel on separate sessions since rows are
+        unique per label; relationship slices run serially to avoid lock
+        contention (and deadlocks) on shared endpoints.
+        
+        Args:
+            node_groups: Node rows keyed by label
+            rel_groups: Relationship rows keyed by (source label, type, target label)
+        """
+        def write_nodes(label: str, rows: list) -> None:
+            with self.driver.session(database=self.config.NEO4J_DATABASE) as session:
+                session.execute_write(self._write_graph_groups, {label: rows}, {})
+        
+        with ThreadPoolExecutor(max_workers=BULK_WRITE_WORKERS) as executor:
+            futures = [
+                executor.submit(write_nodes, label, batch)
+                for label, rows in node_groups.items()
+                for batch in _batched(rows)
+            ]
+            for future in futures:
+                future.result()
+        
+        with self.driver.session(database=self.config.NEO4J_DATABASE) as session:
+            for pattern, rows in rel_groups.items():
+                for batch in _batched(rows):
+                    session.execute_write(self._write_graph_groups, {}, {pattern: batch})
+    
+    @staticmethod
+    def _bulk_write_graph_groups(session, node_groups: Dict[str, list], rel_groups: Dict[tuple, list]) -> None:
+        """
+        Write grouped nodes and relationships with apoc.periodic.iterate
+        
+        Node batches are committed in parallel since rows are unique per label;
+        relationship batches run serially to avoid lock contention on shared endpoints.
+        
+        Args:
+            session: Open Neo4j session (periodic.iterate manages its own transactions)
+            node_groups: Node rows keyed by label
+            rel_groups: Relationship rows keyed by (source label, type, target label)
+        """
+        iterate_query = """
+        CALL apoc.periodic.iterate(
+            'UNWIND $rows AS row RETURN row',
+            $action,
+            {batchSize: $batch_size, parallel: $parallel, params: {rows: $rows}}
+        )
+        YIELD failedBatches, errorMessages
+        RETURN failedBatches, errorMessages
+        """
+        
+        writes = [
+            (f"MERGE (n:{quote_identifier(label)} {{id: row.id}}) SET n += row.props", rows, True)
+            for label, rows in node_groups.items()
+        ]
+        writes.extend(
+            (
+                f"MERGE (s:{quote_identifier(source_label)} {{id: row.src}}) "
+                f"MERGE (t:{quote_identifier(target_label)} {{id: row.dst}}) "
+                f"MERGE (s)-[r:{quote_identifier(rel_type)}]->(t) "
+                "SET r += row.props",
+                rows,
+                False
+            )
+            for (source_label, rel_type, target_label), rows in rel_groups.items()
+        )
+        
+        for action, rows, parallel in writes:
+            record = session.run(iterate_query, {
+                'action': action,
+                'rows': rows,
+                'batch_size': BULK_IMPORT_BATCH_SIZE,
+                'parallel': parallel
+            }).single()
+            if record["failedBatches"]:
+                raise Exception(f"Bulk import failed: {record['errorMessages']}")
+    
     def _get_stats(self) -> Tuple[bool, str, dict]:
         """
         Get statistics about the created knowledge graph
@@ -152,106 +463,109 @@ class GraphBuilder:
             Tuple[bool, str, dict]: (success, message, stats)
         """
         try:
-            from .utilities.graph_stats_utils import get_graph_creation_stats
             return get_graph_creation_stats(self.driver)
         except Exception as e:
             return False, f"Error getting stats: {str(e)}", {}
     
 
     
-    def create_vector_index(self, documents: list) -> Tuple[bool, str]:
+    def create_vector_index(self, documents: list, create_metadata: bool = True,
+                            check_connection: bool = True) -> Tuple[bool, str]:
         """
         Create vector index for embeddings
         
         Args:
             documents: List of chunked Document objects from parse_code_chunks
+            create_metadata: Also write File nodes and link them to the chunks
+                             (create_graphrag_system defers this until the
+                             knowledge graph step has finished)
+            check_connection: Validate (and if needed re-establish) the connection first
             
         Returns:
             Tuple[bool, str]: (success, message)
         """
         try:
             # Ensure we have a healthy connection before proceeding
-            connection_success, connection_message = self.ensure_connection()
-            if not connection_success:
-                return False, f"❌ Database connection failed: {connection_message}"
+            if check_connection:
+                connection_success, connection_message = self.ensure_connection()
+                if not connection_success:
+                    return False, f"❌ Database connection failed: {connection_message}"
             
             if not documents:
                 return False, "❌ No documents provided for vector index creation."
             
             logger.info(f"🔍 Creating vector index for {len(documents)} documents")
             
-            # Import required libraries
-            from langchain_openai import OpenAIEmbeddings
-            import time
-            
-            # Initialize OpenAI embeddings
-            embeddings = OpenAIEmbeddings(
-                model="text-embedding-3-large",
-                openai_api_key=self.config.OPENAI_API_KEY
-            )
+            embeddings = self._create_embeddings()
             
             logger.info("🧮 Generating embeddings for documents...")
             start_time = time.time()
             
-            # Create embeddings for all documents
-            texts = [doc.page_content for doc in documents]
-            metadatas = [doc.metadata for doc in documents]
-            
-            # Generate embeddings
-            doc_embeddings = embeddings.embed_documents(texts)
-            
-            # Store in Neo4j manually to avoid clearing existing data
-            with self.driver.session() as session:
+            _assign_chunk_ids(documents)
+            self.connection.ensure_schema()
+            
+            def embed_slice(docs: list) -> List[List[float]]:
+                # Reuse cached embeddings and embed only new chunk texts
+                return self._embed_with_cache(embeddings, [doc.page_content for doc in docs], embed_loop)
+            
+            # Pipeline embedding and writing one TRANSACTION_BATCH_SIZE slice at a
+            # time so at most two slices of vectors are held in memory at once
+            slices = list(_batched(documents))
+            
+            # Every slice is embedded on one event loop, owned by the embedding
+            # thread, since the client's async HTTP pool is bound to the loop it
+            # first runs on; the loop is closed after the thread has finished
+            with closing(asyncio.new_event_loop()) as embed_loop, \
+                    ThreadPoolExecutor(max_workers=1) as embed_executor, \
+                    self.driver.session(database=self.config.NEO4J_DATABASE) as session:
+                # Create CodeChunk nodes with embeddings in batched UNWIND writes;
+                # setNodeVectorProperty stores the vector as a float32 array
+                # (half the size of a list of doubles on disk and in the page cache)
+                chunk_query = """
+                UNWIND $rows AS row
+                CREATE (c:CodeChunk)
+                SET c = row.properties, c.created_at = datetime()
+                WITH c, row
+                CALL db.create.setNodeVectorProperty(c, 'embedding', row.embedding)
+                """
                 chunks_created = 0
-                
-                for i, (text, metadata, embedding) in enumerate(zip(texts, metadatas, doc_embeddings)):
-                    # Create CodeChunk node with embedding
-                    chunk_query = """
-                    CREATE (c:CodeChunk {
-                        chunk_id: $chunk_id,
-                        text: $text,
-                        embedding: $embedding,
-                        file_path: $file_path,
-                        language: $language,
-                        start_line: $start_line,
-                        end_line: $end_line,
-                        chunk_size: $chunk_size,
-                        created_at: datetime()
-                    })
-                    """
-                    
-                    chunk_id = metadata.get('chunk_id', i)
+                pending = embed_executor.submit(embed_slice, slices[0])
+                for index, docs in enumerate(slices):
+                    slice_embeddings = pending.result()
+                    # Embed the next slice while this one is written to Neo4j
+                    if index + 1 < len(slices):
+                        pending = embed_executor.submit(embed_slice, slices[index + 1])
                     
-                    session.run(chunk_query, {
-                        'chunk_id': chunk_id,
-                        'text': text,
-                        'embedding': embedding,
-                        'file_path': metadata.get('file_path', 'unknown'),
-                        'language': metadata.get('language', 'unknown'),
-                        'start_line': metadata.get('start_line', 0),
-                        'end_line': metadata.get('end_line', 0),
-                        'chunk_size': len(text)
-                    })
-                    
-                    chunks_created += 1
+                    # Store in Neo4j manually to avoid clearing existing data
+                    chunk_rows = [
+                        {
+                            'properties': {
+                                'chunk_id': doc.metadata['chunk_id'],
+                                'text': doc.page_content,
+                                'file_path': doc.metadata.get('file_path', 'unknown'),
+                                'language': doc.metadata.get('language', 'unknown'),
+                                'start_line': doc.metadata.get('start_line', 0),
+                                'end_line': doc.metadata.get('end_line', 0),
+                                'chunk_size': len(doc.page_content)
+                            },
+                            'embedding': embedding
+                        }
+                        for doc, embedding in zip(docs, slice_embeddings)
+                    ]
+                    session.execute_write(_run_unwind_batches, chunk_query, chunk_rows)
+                    chunks_created += len(chunk_rows)
+                self.connection.invalidate_database_info()
                 
                 # Create vector index if it doesn't exist
-                try:
-                    session.run("""
-                    CREATE VECTOR INDEX code_chunks_vector_index IF NOT EXISTS
-                    FOR (c:CodeChunk) ON (c.embedding)
-                    OPTIONS {indexConfig: {
-                        `vector.dimensions`: 3072,
-                        `vector.similarity_function`: 'cosine'
-                    }}
-                    """)
-                except Exception as e:
-                    logger.warning(f"Vector index creation warning: {str(e)}")
-            
-            embedding_time = time.time() - start_time
-            
-            # Create metadata nodes and relationships
-            metadata_success, metadata_message = self._create_metadata_nodes(documents)
+                create_code_chunk_vector_index(session)
+                
+                embedding_time = time.time() - start_time
+                
+                # Create metadata nodes and relationships on the same session
+                if create_metadata:
+                    metadata_success, metadata_message = self._create_metadata_nodes(documents, session)
+                else:
+                    metadata_success, metadata_message = True, "Deferred"
             
             success_message = (
                 f"✅ Vector index created successfully!\n"
@@ -266,89 +580,228 @@ class GraphBuilder:
         except Exception as e:
             return False, f"❌ Error creating vector index: {str(e)}"
     
-    def _create_metadata_nodes(self, documents: list) -> Tuple[bool, str]:
+    def _create_llm(self):
+        """
+        Create the OpenAI chat model used for entity extraction in one graph build
+        
+        The model's async HTTP pool is bound to the event loop it first runs on,
+        and each build transforms its documents on a new asyncio.run loop, so a
+        model is created per build rather than kept on the builder.
+        
+        Returns:
+            ChatOpenAI: Chat model for this build
+        """
+        from langchain_openai import ChatOpenAI
+        
+        return ChatOpenAI(
+            model=self.config.LLM_MODEL,
+            temperature=0,  # Deterministic output for consistent entity extraction
+            openai_api_key=self.config.OPENAI_API_KEY,
+            max_retries=6  # Back off on rate limits when documents run concurrently
+        )
+    
+    def _create_embeddings(self):
+        """
+        Create the OpenAI embeddings client for one vector index build
+        
+        The client's async HTTP pool is bound to the event loop it first runs
+        on, so each build gets its own client and runs all of its requests on
+        one loop; the pool (and its TLS sessions to the OpenAI API) is reused
+        across every slice of the build.
+        
+        Returns:
+            OpenAIEmbeddings: Embeddings client for this build
+        """
+        from langchain_openai import OpenAIEmbeddings
+        
+        return OpenAIEmbeddings(
+            model="text-embedding-3-large",
+            openai_api_key=self.config.OPENAI_API_KEY,
+            chunk_size=self.config.EMBEDDING_BATCH_SIZE,  # One API request per batch
+            max_retries=6  # Back off on rate limits when batches run concurrently
+        )
+    
+    def _embed_texts(self, embeddings, texts: List[str], loop: asyncio.AbstractEventLoop) -> List[List[float]]:
+        """
+        Embed texts in fixed-size batches with a bounded number of concurrent requests
+        
+        Batch size and concurrency come from EMBEDDING_BATCH_SIZE and
+        EMBEDDING_MAX_CONCURRENCY so they can be tuned to the account's rate limits.
+        
+        Args:
+            embeddings: LangChain embeddings client
+            texts: Texts to embed
+            loop: Event loop the client's requests run on (reused across calls)
+            
+        Returns:
+            List[List[float]]: One embedding per text, in input order
+        """
+        batch_size = self.config.EMBEDDING_BATCH_SIZE
+        batches = [texts[start:start + batch_size] for start in range(0, len(texts), batch_size)]
+        
+        async def embed_all() -> list:
+            semaphore = asyncio.Semaphore(self.config.EMBEDDING_MAX_CONCURRENCY)
+            
+            async def embed_batch(batch: List[str]) -> List[List[float]]:
+                async with semaphore:
+                    return await embeddings.aembed_documents(batch)
+            
+            return await asyncio.gather(*(embed_batch(batch) for batch in batches))
+        
+        batch_embeddings = loop.run_until_complete(embed_all())
+        return [embedding for batch in batch_embeddings for embedding in batch]
+    
+    def _embed_with_cache(self, embeddings, texts: List[str], loop: asyncio.AbstractEventLoop) -> List[List[float]]:
+        """
+        Embed each distinct text once, serving unchanged chunks from the embedding cache
+        
+        Identical chunk texts (license headers, generated code) share one
+        embedding. Cache entries are keyed by (sha256(text), model), so
+        re-indexing a repository only sends new or modified chunks to the API.
+        Cache errors are logged and fall back to embedding every distinct text.
+        
+        Args:
+            embeddings: LangChain embeddings client
+            texts: Texts to embed
+            loop: Event loop the client's requests run on
+            
+        Returns:
+            List[List[float]]: One embedding per text, in input order
+        """
+        cache_path = self.config.EMBEDDING_CACHE_PATH
+        model = embeddings.model
+        hashes = [hash_text(text) for text in texts]
+        
+        vectors = {}
+        if cache_path:
+            try:
+                vectors = get_cached_embeddings(cache_path, model, hashes)
+            except (sqlite3.Error, OSError) as e:
+                logger.warning(f"⚠️ Embedding cache unavailable, embedding all chunks: {str(e)}")
+                cache_path = None
+        
+        # Embed each distinct uncached text once
+        uncached = {text_hash: text for text_hash, text in zip(hashes, texts) if text_hash not in vectors}
+        logger.info(
+            f"💾 Embeddings: {len(texts)} chunks, {len(vectors)} cached, "
+            f"{len(uncached)} distinct texts to embed"
+        )
+        
+        if uncached:
+            fresh = dict(zip(uncached, self._embed_texts(embeddings, list(uncached.values()), loop)))
+            if cache_path:
+                try:
+                    store_embeddings(cache_path, model, fresh)
+                except (sqlite3.Error, OSError) as e:
+                    logger.warning(f"⚠️ Could not update embedding cache: {str(e)}")
+            vectors.update(fresh)
+        
+        return [vectors[text_hash] for text_hash in hashes]
+    
+    def _create_metadata_nodes(self, documents: list, session=None) -> Tuple[bool, str]:
         """
         Create File nodes and link to CodeChunk nodes
         
         Args:
             documents: List of Document objects with metadata
+            session: Open Neo4j session to reuse (a new one is opened if omitted)
             
         Returns:
             Tuple[bool, str]: (success, message)
         """
         try:
-            with self.driver.session() as session:
-                files_processed = 0
-                chunks_linked = 0
-                
-                # Group documents by file
-                file_chunks = {}
-                for doc in documents:
-                    file_path = doc.metadata.get('file_path', 'unknown')
-                    if file_path not in file_chunks:
-                        file_chunks[file_path] = []
-                    file_chunks[file_path].append(doc)
-                
-                # Create or update File nodes and link to CodeChunk nodes
-                for file_path, chunks in file_chunks.items():
-                    # Create/update File node
-                    file_query = """
-                    MERGE (f:File {path: $file_path})
-                    SET f.name = $file_name,
-                        f.extension = $extension,
-                        f.language = $language,
-                        f.total_chunks = $chunk_count,
-                        f.total_lines = $total_lines,
-                        f.updated_at = datetime()
-                    """
-                    
-                    # Extract file metadata
-                    file_name = file_path.split('/')[-1] if '/' in file_path else file_path
-                    extension = file_name.split('.')[-1] if '.' in file_name else 'unknown'
-                    language = chunks[0].metadata.get('language', 'unknown')
-                    total_lines = max([chunk.metadata.get('end_line', 0) for chunk in chunks])
-                    
-                    session.run(file_query, {
+            if session is None:
+                with self.driver.session(database=self.config.NEO4J_DATABASE) as own_session:
+                    return self._create_metadata_nodes(documents, own_session)
+            
+            # No-op for chunks already given an id by create_vector_index
+            _assign_chunk_ids(documents)
+            
+            # Aggregate File node properties and collect chunk links in one pass
+            files = {}
+            link_rows = []
+            for doc in documents:
+                metadata = doc.metadata
+                file_path = metadata.get('file_path', 'unknown')
+                file_row = files.get(file_path)
+                if file_row is None:
+                    file_name = os.path.basename(file_path)
+                    file_row = files[file_path] = {
                         'file_path': file_path,
                         'file_name': file_name,
-                        'extension': extension,
-                        'language': language,
-                        'chunk_count': len(chunks),
-                        'total_lines': total_lines
-                    })
-                    files_processed += 1
-                    
-                    # Link CodeChunk nodes to File nodes
-                    for chunk in chunks:
-                        chunk_id = chunk.metadata.get('chunk_id', f"chunk_{hash(chunk.page_content)}")
-                        
-                        link_query = """
-                        MATCH (f:File {path: $file_path})
-                        MATCH (c:CodeChunk {chunk_id: $chunk_id})
-                        MERGE (f)-[:CONTAINS_CHUNK]->(c)
-                        """
-                        
-                        session.run(link_query, {
-                            'file_path': file_path,
-                            'chunk_id': chunk_id
-                        })
-                        chunks_linked += 1
-                
-                message = f"Files: {files_processed}, Chunks linked: {chunks_linked}"
-                return True, message
+                        'extension': os.path.splitext(file_name)[1].lstrip('.') or 'unknown',
+                        'language': metadata.get('language', 'unknown'),
+                        'chunk_count': 0,
+                        'total_lines': 0
+                    }
+                file_row['chunk_count'] += 1
+                file_row['total_lines'] = max(file_row['total_lines'], metadata.get('end_line', 0))
                 
+                # Row linking this CodeChunk node to its File node
+                link_rows.append({'file_path': file_path, 'chunk_id': metadata['chunk_id']})
+            file_rows = list(files.values())
+            
+            if len(file_rows) + len(link_rows) <= TRANSACTION_BATCH_SIZE:
+                # File MERGEs and chunk links commit together in one write transaction
+                session.execute_write(self._write_file_metadata, file_rows, link_rows)
+            else:
+                # Bound transaction state on large repositories: commit File nodes
+                # first, then the links, TRANSACTION_BATCH_SIZE rows at a time
+                for batch in _batched(file_rows):
+                    session.execute_write(self._write_file_metadata, batch, [])
+                for batch in _batched(link_rows):
+                    session.execute_write(self._write_file_metadata, [], batch)
+            files_processed = len(file_rows)
+            chunks_linked = len(link_rows)
+            
+            message = f"Files: {files_processed}, Chunks linked: {chunks_linked}"
+            return True, message
+            
         except Exception as e:
             return False, f"Error creating metadata: {str(e)}"
     
+    @staticmethod
+    def _write_file_metadata(tx, file_rows: List[dict], link_rows: List[dict]) -> None:
+        """
+        Transaction function writing File nodes and their CONTAINS_CHUNK links
+        
+        Args:
+            tx: Neo4j managed transaction
+            file_rows: File node properties keyed by file_path
+            link_rows: {'file_path', 'chunk_id'} pairs to link
+        """
+        # Create/update File nodes in batched UNWIND writes
+        file_query = """
+        UNWIND $rows AS row
+        MERGE (f:File {path: row.file_path})
+        SET f.name = row.file_name,
+            f.extension = row.extension,
+            f.language = row.language,
+            f.total_chunks = row.chunk_count,
+            f.total_lines = row.total_lines,
+            f.updated_at = datetime()
+        """
+        _run_unwind_batches(tx, file_query, file_rows)
+        
+        # Link CodeChunk nodes to File nodes in batched UNWIND writes
+        link_query = """
+        UNWIND $rows AS row
+        MATCH (f:File {path: row.file_path})
+        MATCH (c:CodeChunk {chunk_id: row.chunk_id})
+        MERGE (f)-[:CONTAINS_CHUNK]->(c)
+        """
+        _run_unwind_batches(tx, link_query, link_rows)
+    
     def create_graphrag_system(self, documents: list) -> Tuple[bool, str]:
         """
         Create a complete GraphRAG system with both knowledge graph and vector index
         
         This method:
         1. Creates structural knowledge graph (Class, Function, Interface nodes)
-        2. Creates semantic vector index (CodeChunk nodes with embeddings)
-        3. Creates bridge relationships (REPRESENTS) linking chunks to entities
-        4. Maintains File nodes used by both systems
+        2. Creates semantic vector index (CodeChunk nodes with embeddings),
+           concurrently with step 1
+        3. Maintains File nodes used by both systems, once both steps are done
+        4. Creates bridge relationships (REPRESENTS) linking chunks to entities
         
         Args:
             documents: List of chunked Document objects from parse_code_chunks
@@ -357,36 +810,57 @@ class GraphBuilder:
             Tuple[bool, str]: (success, message)
         """
         try:
-            if not self.is_connected or not self.driver:
-                return False, "❌ Not connected to Neo4j. Please connect first."
-            
             if not documents:
                 return False, "❌ No documents provided for GraphRAG system creation."
             
+            # Validate the connection once here: both workers below share it, and
+            # reconnecting from each of them could close a driver the other uses
+            connection_success, connection_message = self.ensure_connection()
+            if not connection_success:
+                return False, f"❌ Database connection failed: {connection_message}"
+            
             logger.info(f"🚀 Creating GraphRAG system for {len(documents)} documents")
             
-            # Step 1: Create structural knowledge graph
-            logger.info("🧠 Step 1: Creating structural knowledge graph...")
-            kg_success, kg_message = self.generate_knowledge_graph(documents)
+            # Create the schema up front so the two writers below don't race on DDL
+            self.connection.ensure_schema()
+            
+            # Steps 1 and 2 are independent until the bridge step and are both bound
+            # by OpenAI latency, so run them concurrently (the driver is thread-safe
+            # and each step opens its own session). Up to LLM_MAX_CONCURRENCY +
+            # EMBEDDING_MAX_CONCURRENCY OpenAI requests are in flight meanwhile.
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                logger.info("🧠 Step 1: Creating structural knowledge graph...")
+                kg_future = executor.submit(self.generate_knowledge_graph, documents, check_connection=False)
+                
+                logger.info("🔍 Step 2: Creating semantic vector index...")
+                vector_future = executor.submit(
+                    self.create_vector_index, documents, create_metadata=False, check_connection=False
+                )
+                
+                kg_success, kg_message = kg_future.result()
+                vector_success, vector_message = vector_future.result()
             
             if not kg_success:
                 return False, f"❌ Knowledge graph creation failed: {kg_message}"
             
-            # Step 2: Create semantic vector index
-            logger.info("🔍 Step 2: Creating semantic vector index...")
-            vector_success, vector_message = self.create_vector_index(documents)
-            
             if not vector_success:
                 return False, f"❌ Vector index creation failed: {vector_message}"
             
-            # Step 3: Create bridge relationships between structural and semantic layers
-            logger.info("🌉 Step 3: Creating bridge relationships...")
+            # Step 3: Write File nodes after the join, so they are not MERGEd by
+            # both concurrent steps at once (lock contention and deadlock retries)
+            logger.info("📁 Step 3: Linking chunks to File nodes...")
+            metadata_success, metadata_message = self._create_metadata_nodes(documents)
+            if not metadata_success:
+                logger.warning(f"⚠️ File metadata creation had issues: {metadata_message}")
+            
+            # Step 4: Create bridge relationships between structural and semantic layers
+            logger.info("🌉 Step 4: Creating bridge relationships...")
             bridge_success, bridge_message = self._create_bridge_relationships(documents)
             
             if not bridge_success:
                 logger.warning(f"⚠️ Bridge relationships creation had issues: {bridge_message}")
             
-            # Step 4: Get comprehensive statistics
+            # Step 5: Get comprehensive statistics
             stats_success, stats_message = self._get_system_stats()
             
             success_message = (
@@ -405,7 +879,7 @@ class GraphBuilder:
             logger.error(error_msg)
             return False, error_msg
     
-    def _create_bridge_relationships(self, documents: list) -> Tuple[bool, str]:
+    def _create_bridge_relationships(self, documents: list, session=None) -> Tuple[bool, str]:
         """
         Create bridge relationships between CodeChunk nodes and structural entities (Class, Function)
         
@@ -413,57 +887,90 @@ class GraphBuilder:
         
         Args:
             documents: List of Document objects
+            session: Open Neo4j session to reuse (a new one is opened if omitted)
             
         Returns:
             Tuple[bool, str]: (success, message)
         """
         try:
-            with self.driver.session() as session:
-                bridges_created = 0
-                
-                # Create REPRESENTS relationships based on content similarity
-                # This is a simplified approach - in production, you'd use more sophisticated NLP
-                
-                # Link chunks to classes based on class name mentions
-                class_bridge_query = """
-                MATCH (c:CodeChunk)
-                MATCH (cls:Class)
-                WHERE c.text CONTAINS cls.id OR c.text CONTAINS REPLACE(cls.id, 'Class', '')
-                MERGE (c)-[:REPRESENTS]->(cls)
-                """
-                
-                result = session.run(class_bridge_query)
-                bridges_created += result.consume().counters.relationships_created
-                
-                # Link chunks to functions based on function name mentions
-                function_bridge_query = """
-                MATCH (c:CodeChunk)
-                MATCH (f:Function)
-                WHERE c.text CONTAINS f.id OR c.text CONTAINS REPLACE(f.id, '()', '')
-                MERGE (c)-[:REPRESENTS]->(f)
-                """
-                
-                result = session.run(function_bridge_query)
-                bridges_created += result.consume().counters.relationships_created
-                
-                # Create file-level bridges
-                file_bridge_query = """
-                MATCH (c:CodeChunk)
-                MATCH (cls:Class)
-                MATCH (f:File)-[:CONTAINS_CHUNK]->(c)
-                WHERE EXISTS((f)-[:CONTAINS]->(cls))
-                MERGE (c)-[:PART_OF_FILE]->(cls)
-                """
-                
-                result = session.run(file_bridge_query)
-                bridges_created += result.consume().counters.relationships_created
-                
-                message = f"Bridge relationships created: {bridges_created}"
-                return True, message
-                
+            if session is None:
+                with self.driver.session(database=self.config.NEO4J_DATABASE) as own_session:
+                    return self._create_bridge_relationships(documents, own_session)
+            
+            # Create REPRESENTS relationships based on content similarity
+            # This is a simplified approach - in production, you'd use more sophisticated NLP
+            
+            # Fetch entity ids once and find name mentions client-side, instead of
+            # a server-side CodeChunk x entity cartesian product with CONTAINS filters
+            entity_ids = session.execute_read(
+                lambda tx: tx.run("""
+                CALL { MATCH (cls:Class) RETURN collect(cls.id) AS class_ids }
+                CALL { MATCH (fn:Function) RETURN collect(fn.id) AS function_ids }
+                RETURN class_ids, function_ids
+                """).single()
+            )
+            
+            _assign_chunk_ids(documents)
+            class_rows = _find_entity_mentions(documents, entity_ids["class_ids"], 'Class')
+            function_rows = _find_entity_mentions(documents, entity_ids["function_ids"], '()')
+            chunk_rows = [{'chunk_id': doc.metadata['chunk_id']} for doc in documents]
+            
+            # All bridge writes commit together in one retried write transaction
+            bridges_created = session.execute_write(
+                self._write_bridges, class_rows, function_rows, chunk_rows
+            )
+            self.connection.invalidate_database_info()
+            
+            message = f"Bridge relationships created: {bridges_created}"
+            return True, message
+            
         except Exception as e:
             return False, f"Error creating bridge relationships: {str(e)}"
     
+    @staticmethod
+    def _write_bridges(tx, class_rows: List[dict], function_rows: List[dict], chunk_rows: List[dict]) -> int:
+        """
+        Transaction function writing the precomputed bridge relationships
+        
+        Args:
+            tx: Neo4j managed transaction
+            class_rows: {'chunk_id', 'entity_id'} pairs for chunks mentioning a Class
+            function_rows: {'chunk_id', 'entity_id'} pairs for chunks mentioning a Function
+            chunk_rows: {'chunk_id'} rows for file-level bridges
+            
+        Returns:
+            int: Number of relationships created
+        """
+        # Link chunks to classes based on class name mentions
+        class_bridge_query = """
+        UNWIND $rows AS row
+        MATCH (c:CodeChunk {chunk_id: row.chunk_id})
+        MATCH (cls:Class {id: row.entity_id})
+        MERGE (c)-[:REPRESENTS]->(cls)
+        """
+        
+        # Link chunks to functions based on function name mentions
+        function_bridge_query = """
+        UNWIND $rows AS row
+        MATCH (c:CodeChunk {chunk_id: row.chunk_id})
+        MATCH (f:Function {id: row.entity_id})
+        MERGE (c)-[:REPRESENTS]->(f)
+        """
+        
+        # Create file-level bridges
+        file_bridge_query = """
+        UNWIND $rows AS row
+        MATCH (f:File)-[:CONTAINS_CHUNK]->(c:CodeChunk {chunk_id: row.chunk_id})
+        MATCH (f)-[:CONTAINS]->(cls:Class)
+        MERGE (c)-[:PART_OF_FILE]->(cls)
+        """
+        
+        return (
+            _run_unwind_batches(tx, class_bridge_query, class_rows)
+            + _run_unwind_batches(tx, function_bridge_query, function_rows)
+            + _run_unwind_batches(tx, file_bridge_query, chunk_rows)
+        )
+    
     def _get_system_stats(self) -> Tuple[bool, str]:
         """
         Get comprehensive statistics about the GraphRAG system
@@ -472,8 +979,7 @@ class GraphBuilder:
             Tuple[bool, str]: (success, message)
         """
         try:
-            from app.utilities.graph_stats_utils import get_graphrag_system_stats
-            return get_graphrag_system_stats(self.driver)
+            return get_graphrag_system_stats(self.driver, use_apoc=self.connection.has_apoc())
         except Exception as e:
             return False, f"Error getting system stats: {str(e)}"
     
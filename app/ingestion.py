@@ -4,18 +4,20 @@
 import os
 import shutil
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional, Tuple, List
+from typing import Callable, Optional, Tuple, List
 from git import Repo, GitCommandError
 
 # Import utilities
 from .utilities import (
     # File utilities
     format_file_size,
-    get_directory_size,
     is_likely_binary,
+    has_binary_prefix,
     read_file_content,
-    should_exclude_file,
+    compile_exclude_patterns,
+    should_exclude_name,
     has_valid_extension,
     
     # Folder utilities
@@ -26,10 +28,131 @@ from .utilities import (
     # Git utilities
     is_valid_repo_url,
     extract_repo_name,
-    get_repository_info
+    get_repository_info,
+    get_repository_object_size
 )
 
 
+# Threads reading file contents during discovery (reads are I/O-bound)
+FILE_READ_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+# Default code file extensions
+DEFAULT_INCLUDE_EXTENSIONS = [
+    # Python
+    '.py', '.pyx', '.pyi',
+    # JavaScript/TypeScript
+    '.js', '.jsx', '.ts', '.tsx', '.mjs',
+    # Java
+    '.java', '.kt', '.scala',
+    # C/C++
+    '.c', '.cpp', '.cc', '.cxx', '.h', '.hpp', '.hxx',
+    # C#
+    '.cs', '.vb',
+    # Go
+    '.go',
+    # Rust
+    '.rs',
+    # PHP
+    '.php', '.phtml',
+    # Ruby
+    '.rb', '.rbw',
+    # Swift
+    '.swift',
+    # Dart
+    '.dart',
+    # R
+    '.r', '.R',
+    # Shell
+    '.sh', '.bash', '.zsh', '.fish',
+    # Web
+    '.html', '.htm', '.css', '.scss', '.sass', '.less',
+    # Config/Data
+    '.json', '.yaml', '.yml', '.toml', '.ini', '.cfg',
+    '.xml', '.sql', '.md', '.rst', '.txt',
+    # Build files
+    '.gradle', '.maven', '.cmake', '.make', 'Makefile', 'Dockerfile',
+    # Other
+    '.pl', '.lua', '.vim', '.el'
+]
+
+
+def _case_insensitive_glob(text: str) -> str:
+    """Spell each letter of text as a [xX] class so a gitignore-style glob matches any case"""
+    return "".join(f"[{char.lower()}{char.upper()}]" if char.isalpha() else char for char in text)
+
+
+# Sparse checkout patterns (gitignore syntax) selecting the default code files;
+# extensions match in any case, as discovery lowercases suffixes (Foo.PY, App.JS)
+SPARSE_CHECKOUT_PATTERNS = list(dict.fromkeys(
+    f"*{_case_insensitive_glob(extension)}" if extension.startswith('.') else extension
+    for extension in DEFAULT_INCLUDE_EXTENSIONS
+))
+
+# Default exclude patterns
+DEFAULT_EXCLUDE_PATTERNS = [
+    # Version control
+    '.git', '.svn', '.hg', '.bzr',
+    # Dependencies
+    'node_modules', '__pycache__', '.pytest_cache',
+    'venv', 'env', '.env', 'virtualenv',
+    'target', 'build', 'dist', '.gradle',
+    'vendor', 'Pods', 'packages',
+    # IDE/Editor
+    '.vscode', '.idea', '.eclipse', '.settings',
+    '.vs', '*.swp', '*.swo', '*~',
+    # OS
+    '.DS_Store', 'Thumbs.db', 'desktop.ini',
+    # Logs and temp
+    '*.log', '*.tmp', '*.temp', 'logs',
+    # Compiled/Binary
+    '*.pyc', '*.pyo', '*.class', '*.o', '*.so', '*.dll', '*.exe',
+    '*.jar', '*.war', '*.ear', '*.zip', '*.tar', '*.gz',
+    # Media
+    '*.jpg', '*.jpeg', '*.png', '*.gif', '*.svg', '*.ico',
+    '*.mp3', '*.mp4', '*.avi', '*.mov', '*.pdf'
+]
+
+# Programming language by lowercase file extension (without the dot)
+LANGUAGE_MAP = {
+    'py': 'python',
+    'java': 'java',
+    'js': 'javascript',
+    'jsx': 'javascript',
+    'ts': 'typescript',
+    'tsx': 'typescript',
+    'cpp': 'cpp',
+    'cc': 'cpp',
+    'cxx': 'cpp',
+    'c': 'c',
+    'h': 'c',
+    'hpp': 'cpp',
+    'cs': 'csharp',
+    'rb': 'ruby',
+    'go': 'go',
+    'rs': 'rust',
+    'php': 'php',
+    'swift': 'swift',
+    'kt': 'kotlin',
+    'scala': 'scala',
+    'r': 'r',
+    'sql': 'sql',
+    'sh': 'shell',
+    'bash': 'shell',
+    'zsh': 'shell',
+    'ps1': 'powershell',
+    'html': 'html',
+    'css': 'css',
+    'scss': 'scss',
+    'sass': 'sass',
+    'xml': 'xml',
+    'json': 'json',
+    'yaml': 'yaml',
+    'yml': 'yaml',
+    'md': 'markdown',
+    'dockerfile': 'dockerfile'
+}
+
+
 def detect_language_from_extension(extension: str) -> str:
     """
     Detect programming language from file extension
@@ -40,51 +163,11 @@ def detect_language_from_extension(extension: str) -> str:
     Returns:
         str: Programming language name
     """
-    extension = extension.lower().lstrip('.')
-    
-    language_map = {
-        'py': 'python',
-        'java': 'java',
-        'js': 'javascript',
-        'jsx': 'javascript',
-        'ts': 'typescript',
-        'tsx': 'typescript',
-        'cpp': 'cpp',
-        'cc': 'cpp',
-        'cxx': 'cpp',
-        'c': 'c',
-        'h': 'c',
-        'hpp': 'cpp',
-        'cs': 'csharp',
-        'rb': 'ruby',
-        'go': 'go',
-        'rs': 'rust',
-        'php': 'php',
-        'swift': 'swift',
-        'kt': 'kotlin',
-        'scala': 'scala',
-        'r': 'r',
-        'sql': 'sql',
-        'sh': 'shell',
-        'bash': 'shell',
-        'zsh': 'shell',
-        'ps1': 'powershell',
-        'html': 'html',
-        'css': 'css',
-        'scss': 'scss',
-        'sass': 'sass',
-        'xml': 'xml',
-        'json': 'json',
-        'yaml': 'yaml',
-        'yml': 'yaml',
-        'md': 'markdown',
-        'dockerfile': 'dockerfile'
-    }
-    
-    return language_map.get(extension, 'unknown')
+    return LANGUAGE_MAP.get(extension.lower().lstrip('.'), 'unknown')
 
 
-def clone_repository(repo_url: str, target_dir: Optional[str] = None, use_project_dir: bool = True) -> Tuple[bool, str, Optional[str]]:
+def clone_repository(repo_url: str, target_dir: Optional[str] = None, use_project_dir: bool = True,
+                     code_only: bool = True) -> Tuple[bool, str, Optional[str]]:
     """
     Clone a GitHub/Bitbucket repository to a target directory
     
@@ -92,6 +175,9 @@ def clone_repository(repo_url: str, target_dir: Optional[str] = None, use_projec
         repo_url: URL of the repository to clone (supports HTTP/HTTPS/SSH)
         target_dir: Directory to clone the repository into (optional)
         use_project_dir: If True, use project's cloned_repos directory (default: True)
+        code_only: If True, make a blobless partial clone and only check out files
+                   matching DEFAULT_INCLUDE_EXTENSIONS, so large assets are never
+                   downloaded (default: True)
         
     Returns:
         Tuple[bool, str, Optional[str]]: (success, message, cloned_path)
@@ -132,12 +218,29 @@ def clone_repository(repo_url: str, target_dir: Optional[str] = None, use_projec
         print(f"📁 Target directory: {clone_path}")
         
         # Clone the repository
-        repo = Repo.clone_from(
-            url=repo_url,
-            to_path=clone_path,
-            depth=1,  # Shallow clone for faster download
-            single_branch=True  # Only clone the default branch
-        )
+        if code_only:
+            # Blobless clone: file contents are fetched on checkout, and the sparse
+            # checkout limits that to code files (servers without filter support
+            # ignore the option and send a regular shallow clone)
+            repo = Repo.clone_from(
+                url=repo_url,
+                to_path=clone_path,
+                depth=1,  # Shallow clone for faster download
+                single_branch=True,  # Only clone the default branch
+                multi_options=['--filter=blob:none', '--no-checkout']
+            )
+            try:
+                repo.git.sparse_checkout('set', '--no-cone', *SPARSE_CHECKOUT_PATTERNS)
+            except GitCommandError as e:
+                print(f"⚠️ Sparse checkout unavailable, checking out all files: {e}")
+            repo.git.checkout()
+        else:
+            repo = Repo.clone_from(
+                url=repo_url,
+                to_path=clone_path,
+                depth=1,  # Shallow clone for faster download
+                single_branch=True  # Only clone the default branch
+            )
         
         # Verify the clone was successful
         if not repo.git_dir:
@@ -152,7 +255,7 @@ def clone_repository(repo_url: str, target_dir: Optional[str] = None, use_projec
             f"🌿 Branch: {repo_info['branch']}\n"
             f"📝 Latest commit: {repo_info['latest_commit'][:8]}\n"
             f"👤 Author: {repo_info['author']}\n"
-            f"📊 Repository size: {get_directory_size(clone_path)}"
+            f"📊 Git object size: {get_repository_object_size(repo)}"
         )
         
         return True, success_msg, clone_path
@@ -216,167 +319,197 @@ def read_local_folder(folder_path: str) -> Tuple[bool, str, Optional[str]]:
         return False, f"Error validating local folder: {str(e)}", None
 
 
-def discover_code_files(codebase_path: str, include_extensions: Optional[list] = None, exclude_patterns: Optional[list] = None, max_file_size_mb: int = 10) -> Tuple[bool, str, list]:
+def _iter_files(directory: str, skip_directory: Optional[Callable[[str], bool]] = None):
     """
-    Discover and read code files from a codebase directory
-    This function is used by parse_code_chunks() to process files
+    Recursively yield file entries below a directory using os.scandir
+    
+    DirEntry caches the file type from the directory listing, so classifying
+    entries needs no extra stat calls. Like Path.rglob, symlinked directories
+    are not descended into, while symlinks to files are yielded.
     
     Args:
-        codebase_path: Path to the codebase directory
-        include_extensions: List of file extensions to include (e.g., ['.py', '.js', '.java'])
-                          If None, uses default code extensions
-        exclude_patterns: List of patterns to exclude (e.g., ['__pycache__', '.git', 'node_modules'])
-                         If None, uses default exclude patterns
-        max_file_size_mb: Maximum file size in MB to process (default: 10MB)
+        directory: Directory to walk
+        skip_directory: Called with each subdirectory name; subtrees for which it
+                        returns a truthy value are pruned without being listed
         
-    Returns:
-        Tuple[bool, str, list]: (success, message, file_data_list)
-            - success: True if discovery was successful, False otherwise
-            - message: Success/error message
-            - file_data_list: List of dictionaries with file information
+    Yields:
+        os.DirEntry: One entry per regular file (or symlink to one)
     """
     try:
-        codebase_path = Path(codebase_path).resolve()
-        
-        # Validate path exists
-        if not codebase_path.exists() or not codebase_path.is_dir():
-            return False, f"Invalid codebase path: {codebase_path}", []
-        
-        # Default code file extensions
-        if include_extensions is None:
-            include_extensions = [
-                # Python
-                '.py', '.pyx', '.pyi',
-                # JavaScript/TypeScript
-                '.js', '.jsx', '.ts', '.tsx', '.mjs',
-                # Java
-                '.java', '.kt', '.scala',
-                # C/C++
-                '.c', '.cpp', '.cc', '.cxx', '.h', '.hpp', '.hxx',
-                # C#
-                '.cs', '.vb',
-                # Go
-                '.go',
-                # Rust
-                '.rs',
-                # PHP
-                '.php', '.phtml',
-                # Ruby
-                '.rb', '.rbw',
-                # Swift
-                '.swift',
-                # Dart
-                '.dart',
-                # R
-                '.r', '.R',
-                # Shell
-                '.sh', '.bash', '.zsh', '.fish',
-                # Web
-                '.html', '.htm', '.css', '.scss', '.sass', '.less',
-                # Config/Data
-                '.json', '.yaml', '.yml', '.toml', '.ini', '.cfg',
-                '.xml', '.sql', '.md', '.rst', '.txt',
-                # Build files
-                '.gradle', '.maven', '.cmake', '.make', 'Makefile', 'Dockerfile',
-                # Other
-                '.pl', '.lua', '.vim', '.el'
-            ]
-        
-        # Default exclude patterns
-        if exclude_patterns is None:
-            exclude_patterns = [
-                # Version control
-                '.git', '.svn', '.hg', '.bzr',
-                # Dependencies
-                'node_modules', '__pycache__', '.pytest_cache',
-                'venv', 'env', '.env', 'virtualenv',
-                'target', 'build', 'dist', '.gradle',
-                'vendor', 'Pods', 'packages',
-                # IDE/Editor
-                '.vscode', '.idea', '.eclipse', '.settings',
-                '.vs', '*.swp', '*.swo', '*~',
-                # OS
-                '.DS_Store', 'Thumbs.db', 'desktop.ini',
-                # Logs and temp
-                '*.log', '*.tmp', '*.temp', 'logs',
-                # Compiled/Binary
-                '*.pyc', '*.pyo', '*.class', '*.o', '*.so', '*.dll', '*.exe',
-                '*.jar', '*.war', '*.ear', '*.zip', '*.tar', '*.gz',
-                # Media
-                '*.jpg', '*.jpeg', '*.png', '*.gif', '*.svg', '*.ico',
-                '*.mp3', '*.mp4', '*.avi', '*.mov', '*.pdf'
-            ]
-        
-        print(f"🔍 Discovering code files in: {codebase_path}")
-        print(f"📝 Looking for extensions: {', '.join(include_extensions[:10])}{'...' if len(include_extensions) > 10 else ''}")
-        
-        file_data_list = []
-        total_files_found = 0
-        total_files_processed = 0
-        total_size_bytes = 0
-        max_file_size_bytes = max_file_size_mb * 1024 * 1024
-        
-        # Walk through all files in the directory
-        for file_path in codebase_path.rglob('*'):
-            if file_path.is_file():
-                total_files_found += 1
-                
-                # Check if file should be excluded
-                if should_exclude_file(file_path, codebase_path, exclude_patterns):
-                    continue
-                
-                # Check file extension
-                if not has_valid_extension(file_path, include_extensions):
-                    continue
-                
-                # Check file size
+        with os.scandir(directory) as entries:
+            for entry in entries:
                 try:
-                    file_size = file_path.stat().st_size
-                    if file_size > max_file_size_bytes:
-                        print(f"⚠️ Skipping large file: {file_path.name} ({file_size / (1024*1024):.1f}MB)")
-                        continue
-                    
-                    total_size_bytes += file_size
+                    if entry.is_dir(follow_symlinks=False):
+                        if skip_directory is None or not skip_directory(entry.name):
+                            yield from _iter_files(entry.path, skip_directory)
+                    elif entry.is_file():
+                        yield entry
                 except OSError:
                     continue
-                
-                # Read file content
+    except OSError:
+        return  # Unreadable directory
+
+
+def _read_text_file(file_path: Path) -> Optional[str]:
+    """
+    Read a file's content unless its first bytes show it is binary
+    
+    Args:
+        file_path: Path to the file
+        
+    Returns:
+        Optional[str]: File content, or None for binary or unreadable files
+    """
+    if has_binary_prefix(file_path):
+        return None
+    return read_file_content(file_path)
+
+
+def _iter_code_files(codebase_path: Path, include_extensions: Optional[list] = None,
+                     exclude_patterns: Optional[list] = None, max_file_size_mb: int = 10,
+                     stats: Optional[dict] = None):
+    """
+    Yield file data for the code files in a codebase, one file at a time
+    
+    Files are yielded in relative path order, and at most FILE_READ_WORKERS * 2
+    files are read ahead, so callers can process each one and drop it before
+    the rest of the codebase is loaded. Files whose first bytes contain NULs
+    are skipped without being read in full.
+    
+    Args:
+        codebase_path: Resolved path to an existing codebase directory
+        include_extensions: File extensions to include (None uses DEFAULT_INCLUDE_EXTENSIONS)
+        exclude_patterns: Patterns to exclude (None uses DEFAULT_EXCLUDE_PATTERNS)
+        max_file_size_mb: Maximum file size in MB to process (default: 10MB)
+        stats: Optional dict filled with 'files_found' and 'total_size_bytes' as the walk runs
+        
+    Yields:
+        dict: File information (path, content, size, line count, ...)
+    """
+    if include_extensions is None:
+        include_extensions = DEFAULT_INCLUDE_EXTENSIONS
+    if exclude_patterns is None:
+        exclude_patterns = DEFAULT_EXCLUDE_PATTERNS
+    
+    print(f"🔍 Discovering code files in: {codebase_path}")
+    print(f"📝 Looking for extensions: {', '.join(include_extensions[:10])}{'...' if len(include_extensions) > 10 else ''}")
+    
+    if stats is None:
+        stats = {}
+    stats['files_found'] = 0
+    stats['total_size_bytes'] = 0
+    max_file_size_bytes = max_file_size_mb * 1024 * 1024
+    compiled_patterns = compile_exclude_patterns(exclude_patterns)
+    # Hashed membership for the per-file extension check
+    include_extension_set = frozenset(include_extensions)
+    
+    # Every file below a directory whose name matches an exclude pattern would
+    # be excluded anyway, so prune those directories (.git, node_modules, ...)
+    # instead of listing their contents
+    substring_regex = compiled_patterns[0]
+    skip_directory = substring_regex.search if substring_regex else None
+    
+    # Walk through all files in the directory, collecting the ones to read
+    candidates = []
+    for entry in _iter_files(str(codebase_path), skip_directory):
+        file_path = Path(entry.path)
+        stats['files_found'] += 1
+        
+        # Check if file should be excluded; every ancestor directory already
+        # passed skip_directory, so only the file name is left to match
+        if should_exclude_name(entry.name, compiled_patterns):
+            continue
+        
+        # Check file extension
+        if not has_valid_extension(file_path, include_extension_set):
+            continue
+        
+        # Check file size (one stat call, reused for the modified time)
+        try:
+            file_stat = entry.stat()
+            file_size = file_stat.st_size
+            if file_size > max_file_size_bytes:
+                print(f"⚠️ Skipping large file: {file_path.name} ({file_size / (1024*1024):.1f}MB)")
+                continue
+            
+            stats['total_size_bytes'] += file_size
+        except OSError:
+            continue
+        
+        candidates.append((str(file_path.relative_to(codebase_path)), file_path, file_stat))
+    
+    # Sort files by relative path for consistent ordering
+    candidates.sort(key=lambda candidate: candidate[0])
+    
+    # Read file contents on a thread pool; reads are I/O-bound, so they overlap
+    # well even with the GIL. Windows bound how far reads run ahead of the caller,
+    # and results come back in submission order.
+    read_ahead = FILE_READ_WORKERS * 2
+    with ThreadPoolExecutor(max_workers=FILE_READ_WORKERS) as executor:
+        for start in range(0, len(candidates), read_ahead):
+            window = candidates[start:start + read_ahead]
+            file_contents = executor.map(_read_text_file, [file_path for _, file_path, _ in window])
+            
+            for (relative_path, file_path, file_stat), file_content in zip(window, file_contents):
                 try:
-                    file_content = read_file_content(file_path)
                     if file_content is None:
                         continue
                     
                     # Create file data dictionary
-                    relative_path = file_path.relative_to(codebase_path)
                     file_data = {
                         'name': file_path.name,
                         'path': str(file_path),
-                        'relative_path': str(relative_path),
+                        'relative_path': relative_path,
                         'extension': file_path.suffix.lower(),
-                        'size_bytes': file_size,
-                        'size_human': format_file_size(file_size),
+                        'size_bytes': file_stat.st_size,
+                        'size_human': format_file_size(file_stat.st_size),
                         'content': file_content,
                         'lines': len(file_content.splitlines()),
-                        'modified_time': file_path.stat().st_mtime,
+                        'modified_time': file_stat.st_mtime,
                         'is_binary': is_likely_binary(file_content)
                     }
                     
-                    file_data_list.append(file_data)
-                    total_files_processed += 1
-                    
                 except Exception as e:
                     print(f"⚠️ Error reading file {file_path}: {e}")
                     continue
+                
+                yield file_data
+
+
+def discover_code_files(codebase_path: str, include_extensions: Optional[list] = None, exclude_patterns: Optional[list] = None, max_file_size_mb: int = 10) -> Tuple[bool, str, list]:
+    """
+    Discover and read code files from a codebase directory
+    
+    Args:
+        codebase_path: Path to the codebase directory
+        include_extensions: List of file extensions to include (e.g., ['.py', '.js', '.java'])
+                          If None, uses default code extensions
+        exclude_patterns: List of patterns to exclude (e.g., ['__pycache__', '.git', 'node_modules'])
+                         If None, uses default exclude patterns
+        max_file_size_mb: Maximum file size in MB to process (default: 10MB)
+        
+    Returns:
+        Tuple[bool, str, list]: (success, message, file_data_list)
+            - success: True if discovery was successful, False otherwise
+            - message: Success/error message
+            - file_data_list: List of dictionaries with file information
+    """
+    try:
+        codebase_path = Path(codebase_path).resolve()
         
-        # Sort files by relative path for consistent ordering
-        file_data_list.sort(key=lambda x: x['relative_path'])
+        # Validate path exists
+        if not codebase_path.exists() or not codebase_path.is_dir():
+            return False, f"Invalid codebase path: {codebase_path}", []
+        
+        stats = {}
+        file_data_list = list(_iter_code_files(codebase_path, include_extensions, exclude_patterns, max_file_size_mb, stats))
         
         success_message = (
             f"✅ Successfully discovered code files!\n"
             f"📍 Location: {codebase_path}\n"
-            f"📊 Files found: {total_files_found}\n"
-            f"📝 Files processed: {total_files_processed}\n"
-            f"💾 Total size: {format_file_size(total_size_bytes)}\n"
+            f"📊 Files found: {stats['files_found']}\n"
+            f"📝 Files processed: {len(file_data_list)}\n"
+            f"💾 Total size: {format_file_size(stats['total_size_bytes'])}\n"
             f"🗂️ File types: {', '.join(sorted(set(f['extension'] for f in file_data_list if f['extension'])))}"
         )
         
@@ -410,26 +543,40 @@ def parse_code_chunks(codebase_path: str, chunk_size: int = 500, chunk_overlap:
         print(f"📝 Parsing code chunks from: {codebase_path}")
         print(f"⚙️ Chunk size: {chunk_size}, Overlap: {chunk_overlap}")
         
-        # Step 1: Discover code files
-        success, discovery_message, file_data_list = discover_code_files(
-            codebase_path, 
-            include_extensions=include_extensions,
-            exclude_patterns=exclude_patterns
-        )
-        
-        if not success:
-            return False, f"Failed to discover code files: {discovery_message}", []
+        # Step 1: Set up text splitter for code
+        # Use language-specific separators for better code chunking
+        code_separators = [
+            # Python
+            "\nclass ", "\ndef ", "\n\ndef ", "\n\nclass ",
+            # Java/C++/JavaScript
+            "\npublic class ", "\nprivate class ", "\nprotected class ",
+            "\npublic ", "\nprivate ", "\nprotected ",
+            "\nfunction ", "\n\nfunction ",
+            # General code patterns
+            "\n\n", "\n", " ", ""
+        ]
         
-        if not file_data_list:
-            return False, "No code files found in the codebase", []
+        text_splitter = RecursiveCharacterTextSplitter(
+            separators=code_separators,
+            chunk_size=chunk_size,
+            chunk_overlap=chunk_overlap,
+            length_function=len,
+            is_separator_regex=False,
+        )
         
-        print(f"📁 Found {len(file_data_list)} code files to process")
+        # Step 2: Discover code files
+        resolved_path = Path(codebase_path).resolve()
+        if not resolved_path.exists() or not resolved_path.is_dir():
+            return False, f"Failed to discover code files: Invalid codebase path: {resolved_path}", []
         
-        # Step 2: Create LangChain Documents from file data
-        documents = []
+        # Step 3: Stream each file through a LangChain Document into the splitter,
+        # so only one file's full content is held alongside the chunks
+        print(f"✂️ Splitting documents into chunks...")
+        chunked_documents = []
+        documents_created = 0
         total_content_size = 0
         
-        for file_data in file_data_list:
+        for file_data in _iter_code_files(resolved_path, include_extensions, exclude_patterns):
             # Create metadata for the document
             metadata = {
                 'source': file_data['path'],
@@ -439,8 +586,12 @@ def parse_code_chunks(codebase_path: str, chunk_size: int = 500, chunk_overlap:
                 'file_size_bytes': file_data['size_bytes'],
                 'file_size_human': file_data['size_human'],
                 'lines': file_data['lines'],
+                'language': detect_language_from_extension(file_data['extension']),
                 'modified_time': file_data['modified_time'],
-                'is_binary': file_data['is_binary']
+                'is_binary': file_data['is_binary'],
+                'codebase_path': codebase_path,
+                # Standardize to the key graph_builder expects
+                'file_path': file_data['path']
             }
             
             # Create LangChain Document
@@ -449,50 +600,25 @@ def parse_code_chunks(codebase_path: str, chunk_size: int = 500, chunk_overlap:
                 metadata=metadata
             )
             
-            documents.append(document)
+            chunked_documents.extend(text_splitter.split_documents([document]))
+            documents_created += 1
             total_content_size += len(file_data['content'])
         
-        print(f"📄 Created {len(documents)} documents ({format_file_size(total_content_size)} total content)")
-        
-        # Step 3: Set up text splitter for code
-        # Use language-specific separators for better code chunking
-        code_separators = [
-            # Python
-            "\nclass ", "\ndef ", "\n\ndef ", "\n\nclass ",
-            # Java/C++/JavaScript
-            "\npublic class ", "\nprivate class ", "\nprotected class ",
-            "\npublic ", "\nprivate ", "\nprotected ",
-            "\nfunction ", "\n\nfunction ",
-            # General code patterns
-            "\n\n", "\n", " ", ""
-        ]
-        
-        text_splitter = RecursiveCharacterTextSplitter(
-            separators=code_separators,
-            chunk_size=chunk_size,
-            chunk_overlap=chunk_overlap,
-            length_function=len,
-            is_separator_regex=False,
-        )
+        if documents_created == 0:
+            return False, "No code files found in the codebase", []
         
-        # Step 4: Split documents into chunks
-        print(f"✂️ Splitting documents into chunks...")
-        chunked_documents = text_splitter.split_documents(documents)
+        print(f"📄 Created {documents_created} documents ({format_file_size(total_content_size)} total content)")
         
-        # Step 5: Add chunk-specific metadata
+        # Step 4: Add chunk-specific metadata (per-file keys such as file_path,
+        # language and codebase_path are inherited from the document)
         for i, chunk in enumerate(chunked_documents):
-            chunk.metadata['chunk_id'] = i
-            chunk.metadata['chunk_size'] = len(chunk.page_content)
-            chunk.metadata['codebase_path'] = codebase_path
-            
-            # Fix metadata key mismatch - standardize to what graph_builder expects
-            chunk.metadata['file_path'] = chunk.metadata.get('source', 'unknown')
-            chunk.metadata['language'] = detect_language_from_extension(chunk.metadata.get('file_extension', ''))
-            
-            # Add line number tracking for chunks (approximate)
-            content_lines = chunk.page_content.split('\n')
-            chunk.metadata['start_line'] = 1  # Will be improved with better chunking
-            chunk.metadata['end_line'] = len(content_lines)
+            chunk.metadata.update({
+                'chunk_id': i,
+                'chunk_size': len(chunk.page_content),
+                # Add line number tracking for chunks (approximate)
+                'start_line': 1,  # Will be improved with better chunking
+                'end_line': chunk.page_content.count('\n') + 1
+            })
         
         # Calculate statistics
         total_chunks = len(chunked_documents)
@@ -501,8 +627,8 @@ def parse_code_chunks(codebase_path: str, chunk_size: int = 500, chunk_overlap:
         success_message = (
             f"✅ Successfully parsed code into chunks!\n"
             f"📍 Codebase: {codebase_path}\n"
-            f"📁 Files processed: {len(file_data_list)}\n"
-            f"📄 Documents created: {len(documents)}\n"
+            f"📁 Files processed: {documents_created}\n"
+            f"📄 Documents created: {documents_created}\n"
             f"✂️ Total chunks: {total_chunks}\n"
             f"📏 Average chunk size: {avg_chunk_size:.0f} characters\n"
             f"💾 Total content: {format_file_size(total_content_size)}"
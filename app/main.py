@@ -17,7 +17,7 @@ project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
 from app.database import initialize_database, get_neo4j_connection
-from app.config import Config
+from app.config import get_config
 from app.ingestion import clone_repository, read_local_folder, parse_code_chunks
 from app.graph_builder import GraphBuilder
 from app.query_processor import QueryProcessor
@@ -148,7 +148,7 @@ def sync_session_state_with_database():
                 # Check if we have CodeChunk nodes (indicates ingestion completed)
                 driver = connection.get_driver()
                 if driver:
-                    with driver.session() as session:
+                    with driver.session(database=get_config().NEO4J_DATABASE) as session:
                         # Check for CodeChunk nodes (safely handle case where they don't exist)
                         try:
                             chunk_result = session.run("MATCH (c:CodeChunk) RETURN count(c) as count LIMIT 1")
@@ -250,7 +250,7 @@ def show_system_status():
     """Display comprehensive system status in the sidebar"""
     st.sidebar.markdown("## 🔧 System Status")
     
-    config = Config()
+    config = get_config()
     
     # Database Status
     if st.session_state.get('database_connected', False):
@@ -299,6 +299,7 @@ def show_system_status():
                     if driver:
                         success, message = clear_database(driver, confirm=True)
                         if success:
+                            connection.invalidate_database_info()
                             st.sidebar.success("✅ Database cleared successfully!")
                             # Reset session state
                             st.session_state.codebase_ingested = False
@@ -737,6 +738,7 @@ def handle_database_management():
                     success, message = clear_database(driver, confirm=True)
                     
                     if success:
+                        connection.invalidate_database_info()
                         st.success("✅ Database cleared successfully!")
                         # Reset session state
                         st.session_state.codebase_ingested = False
@@ -761,7 +763,7 @@ def handle_database_management():
         
         if st.button("🔍 View Current Data", type="secondary"):
             # Show current database state
-            success, db_info = connection.get_database_info()
+            success, db_info = connection.get_database_info(use_cache=False)
             if success:
                 st.json({
                     "nodes": db_info.get('node_count', 0),
@@ -4,7 +4,7 @@
 import logging
 from typing import Optional, List, Dict, Tuple, Any
 from neo4j import Driver
-from .config import Config
+from .config import get_config
 from .database import get_neo4j_connection
 
 # Set up logging
@@ -17,7 +17,7 @@ class QueryProcessor:
     
     def __init__(self):
         """Initialize QueryProcessor with singleton database connection"""
-        self.config = Config()
+        self.config = get_config()
         # Use singleton connection instead of creating our own
         self.connection = get_neo4j_connection()
         self.embeddings = None
@@ -72,21 +72,18 @@ class QueryProcessor:
             if not connection_success:
                 return False, f"❌ Database connection failed: {connection_message}"
             
-            # Initialize OpenAI embeddings
-            from langchain_openai import OpenAIEmbeddings
-            
-            self.embeddings = OpenAIEmbeddings(
-                model="text-embedding-3-large",
-                openai_api_key=self.config.OPENAI_API_KEY
-            )
-            
-            # Verify vector index exists
-            with self.driver.session() as session:
-                index_result = session.run("SHOW INDEXES YIELD name WHERE name = 'code_chunks_vector_index'")
-                index_exists = len(list(index_result)) > 0
+            # Initialize OpenAI embeddings once; later setups reuse the client and its connections
+            if self.embeddings is None:
+                from langchain_openai import OpenAIEmbeddings
                 
-                if not index_exists:
-                    return False, "❌ Vector index 'code_chunks_vector_index' not found. Please create GraphRAG system first."
+                self.embeddings = OpenAIEmbeddings(
+                    model="text-embedding-3-large",
+                    openai_api_key=self.config.OPENAI_API_KEY
+                )
+            
+            # Verify vector index exists (cached on the connection once found)
+            if not self.connection.has_vector_index():
+                return False, "❌ Vector index 'code_chunks_vector_index' not found. Please create GraphRAG system first."
             
             logger.info("✅ QueryProcessor retrievers set up successfully")
             return True, "✅ QueryProcessor retrievers set up successfully"
@@ -174,7 +171,7 @@ class QueryProcessor:
             query_embedding = self.embeddings.embed_query(query)
             
             # Perform vector search in Neo4j
-            with self.driver.session() as session:
+            with self.driver.session(database=self.config.NEO4J_DATABASE) as session:
                 vector_query = """
                 CALL db.index.vector.queryNodes('code_chunks_vector_index', $k, $query_embedding)
                 YIELD node, score
@@ -228,7 +225,7 @@ class QueryProcessor:
             chunk_ids = [result['chunk_id'] for result in vector_results]
             file_paths = list(set([result['file_path'] for result in vector_results]))
             
-            with self.driver.session() as session:
+            with self.driver.session(database=self.config.NEO4J_DATABASE) as session:
                 # Find entities (Classes, Functions) related to these chunks
                 entity_query = """
                 MATCH (c:CodeChunk)-[:REPRESENTS]->(entity)
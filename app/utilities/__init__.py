@@ -5,7 +5,10 @@ from .file_utils import (
     format_file_size,
     get_directory_size,
     is_likely_binary,
+    has_binary_prefix,
     read_file_content,
+    compile_exclude_patterns,
+    should_exclude_name,
     should_exclude_file,
     has_valid_extension
 )
@@ -19,15 +22,27 @@ from .folder_utils import (
 from .git_utils import (
     is_valid_repo_url,
     extract_repo_name,
-    get_repository_info
+    get_repository_info,
+    get_repository_object_size
 )
 
 from .neo4j_utils import (
     check_neo4j_health,
     clear_database,
     get_database_statistics,
+    count_nodes_by_label,
+    count_relationships_by_type,
+    get_label_and_type_counts,
+    create_code_chunk_vector_index,
     create_constraints_and_indexes,
-    clear_knowledge_graph
+    clear_knowledge_graph,
+    quote_identifier
+)
+
+from .embedding_cache import (
+    hash_text,
+    get_cached_embeddings,
+    store_embeddings
 )
 
 from .graph_stats_utils import (
@@ -48,7 +63,10 @@ __all__ = [
     'format_file_size',
     'get_directory_size', 
     'is_likely_binary',
+    'has_binary_prefix',
     'read_file_content',
+    'compile_exclude_patterns',
+    'should_exclude_name',
     'should_exclude_file',
     'has_valid_extension',
     
@@ -61,13 +79,24 @@ __all__ = [
     'is_valid_repo_url',
     'extract_repo_name',
     'get_repository_info',
+    'get_repository_object_size',
     
     # Neo4j utilities
     'check_neo4j_health',
     'clear_database',
     'get_database_statistics',
+    'count_nodes_by_label',
+    'count_relationships_by_type',
+    'get_label_and_type_counts',
+    'create_code_chunk_vector_index',
     'create_constraints_and_indexes',
     'clear_knowledge_graph',
+    'quote_identifier',
+    
+    # Embedding cache utilities
+    'hash_text',
+    'get_cached_embeddings',
+    'store_embeddings',
     
     # Graph statistics utilities
     'get_graph_creation_stats',
@@ -0,0 +1,96 @@
+# Code Graph - Embedding Cache Utilities
+# Persistent cache of chunk embeddings keyed by content hash and model
+
+import hashlib
+import sqlite3
+from array import array
+from contextlib import closing
+from pathlib import Path
+from typing import Dict, List
+
+# SQLite builds older than 3.32 cap bound parameters per statement at 999
+LOOKUP_BATCH_SIZE = 900
+
+
+def hash_text(text: str) -> str:
+    """
+    Compute the cache key for a chunk of text
+
+    Args:
+        text: Chunk text
+
+    Returns:
+        str: Hex SHA-256 digest of the UTF-8 encoded text
+    """
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def _connect(cache_path: str) -> sqlite3.Connection:
+    """
+    Open the cache database, creating the file and table on first use
+
+    Args:
+        cache_path: Path to the SQLite cache file
+
+    Returns:
+        sqlite3.Connection: Open connection to the cache
+    """
+    Path(cache_path).parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(cache_path)
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS embedding_cache ("
+        "hash TEXT NOT NULL, model TEXT NOT NULL, vec BLOB NOT NULL, "
+        "PRIMARY KEY (hash, model))"
+    )
+    return conn
+
+
+def get_cached_embeddings(cache_path: str, model: str, hashes: List[str]) -> Dict[str, List[float]]:
+    """
+    Look up cached embeddings for a set of content hashes
+
+    Args:
+        cache_path: Path to the SQLite cache file
+        model: Embedding model name the vectors were produced with
+        hashes: Content hashes from hash_text
+
+    Returns:
+        Dict[str, List[float]]: Embedding per cached hash; misses are absent
+    """
+    unique_hashes = list(dict.fromkeys(hashes))
+    found = {}
+
+    with closing(_connect(cache_path)) as conn, conn:
+        for start in range(0, len(unique_hashes), LOOKUP_BATCH_SIZE):
+            batch = unique_hashes[start:start + LOOKUP_BATCH_SIZE]
+            placeholders = ", ".join("?" * len(batch))
+            rows = conn.execute(
+                f"SELECT hash, vec FROM embedding_cache WHERE model = ? AND hash IN ({placeholders})",
+                [model, *batch]
+            )
+            for text_hash, vec in rows:
+                found[text_hash] = array('f', vec).tolist()
+
+    return found
+
+
+def store_embeddings(cache_path: str, model: str, entries: Dict[str, List[float]]) -> None:
+    """
+    Insert or replace embeddings in the cache
+
+    Vectors are stored as packed float32, half the size of the doubles the
+    API returns and the same precision Neo4j keeps for vector properties.
+
+    Args:
+        cache_path: Path to the SQLite cache file
+        model: Embedding model name the vectors were produced with
+        entries: Embedding per content hash
+    """
+    if not entries:
+        return
+
+    with closing(_connect(cache_path)) as conn, conn:
+        conn.executemany(
+            "INSERT OR REPLACE INTO embedding_cache (hash, model, vec) VALUES (?, ?, ?)",
+            [(text_hash, model, array('f', vector).tobytes()) for text_hash, vector in entries.items()]
+        )
@@ -2,8 +2,9 @@
 # File-related utility functions
 
 import os
+import re
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Pattern, Tuple
 
 
 def format_file_size(size_bytes: int) -> str:
@@ -47,6 +48,10 @@ def get_directory_size(directory_path: str) -> str:
         return "Unknown size"
 
 
+# str.translate table deleting printable and whitespace ASCII characters
+_ASCII_TEXT_CHARS = {code: None for code in range(128) if chr(code).isprintable() or chr(code).isspace()}
+
+
 def is_likely_binary(content: str) -> bool:
     """
     Check if content is likely binary (contains non-printable characters)
@@ -62,20 +67,47 @@ def is_likely_binary(content: str) -> bool:
         if '\x00' in content:
             return True
         
-        # Check ratio of printable characters
-        printable_chars = sum(1 for c in content if c.isprintable() or c.isspace())
         total_chars = len(content)
-        
         if total_chars == 0:
             return False
         
-        printable_ratio = printable_chars / total_chars
+        # Strip printable ASCII in C, then classify only the remaining characters
+        remaining = content.translate(_ASCII_TEXT_CHARS)
+        non_printable_chars = sum(1 for c in remaining if not (c.isprintable() or c.isspace()))
+        
+        # Check ratio of printable characters
+        printable_ratio = (total_chars - non_printable_chars) / total_chars
         return printable_ratio < 0.7  # If less than 70% printable, likely binary
         
     except Exception:
         return True
 
 
+def has_binary_prefix(file_path: Path, prefix_size: int = 8192) -> bool:
+    """
+    Check the start of a file for NUL bytes without reading the whole file
+    
+    UTF-16/UTF-32 text contains NUL bytes too, so files starting with a
+    byte order mark are never reported as binary.
+    
+    Args:
+        file_path: Path to the file
+        prefix_size: Number of leading bytes to inspect
+        
+    Returns:
+        bool: True if the prefix looks binary, False otherwise (or if unreadable)
+    """
+    try:
+        with open(file_path, 'rb') as f:
+            prefix = f.read(prefix_size)
+    except OSError:
+        return False  # Let the full read report the problem
+    
+    if prefix.startswith((b'\xff\xfe', b'\xfe\xff')):
+        return False
+    return b'\x00' in prefix
+
+
 def read_file_content(file_path: Path) -> Optional[str]:
     """
     Read file content with proper encoding detection
@@ -104,7 +136,42 @@ def read_file_content(file_path: Path) -> Optional[str]:
     return None
 
 
-def should_exclude_file(file_path: Path, base_path: Path, exclude_patterns: list) -> bool:
+def compile_exclude_patterns(exclude_patterns: list) -> Tuple[Optional[Pattern], Tuple[str, ...]]:
+    """
+    Precompile exclude patterns for repeated should_exclude_file calls
+    
+    Args:
+        exclude_patterns: List of patterns to exclude
+        
+    Returns:
+        Tuple[Optional[Pattern], Tuple[str, ...]]: (substring_regex, wildcard_suffixes)
+            - substring_regex: Matches any pattern occurring in a path part (None if no patterns)
+            - wildcard_suffixes: File name suffixes from '*.ext' patterns
+    """
+    substring_regex = re.compile("|".join(map(re.escape, exclude_patterns))) if exclude_patterns else None
+    wildcard_suffixes = tuple(pattern[1:] for pattern in exclude_patterns if pattern.startswith('*.'))
+    return substring_regex, wildcard_suffixes
+
+
+def should_exclude_name(name: str, compiled_patterns: Tuple[Optional[Pattern], Tuple[str, ...]]) -> bool:
+    """
+    Check a single file or directory name against precompiled exclude patterns
+    
+    Args:
+        name: File or directory name (one path part)
+        compiled_patterns: Result of compile_exclude_patterns
+        
+    Returns:
+        bool: True if the name should be excluded, False otherwise
+    """
+    substring_regex, wildcard_suffixes = compiled_patterns
+    if substring_regex is not None and substring_regex.search(name):
+        return True
+    return bool(wildcard_suffixes) and name.endswith(wildcard_suffixes)
+
+
+def should_exclude_file(file_path: Path, base_path: Path, exclude_patterns: list,
+                        compiled_patterns: Optional[Tuple[Optional[Pattern], Tuple[str, ...]]] = None) -> bool:
     """
     Check if a file should be excluded based on exclude patterns
     
@@ -112,30 +179,26 @@ def should_exclude_file(file_path: Path, base_path: Path, exclude_patterns: list
         file_path: Path to the file
         base_path: Base directory path
         exclude_patterns: List of patterns to exclude
+        compiled_patterns: Result of compile_exclude_patterns(exclude_patterns), to
+                           avoid recompiling when checking many files
         
     Returns:
         bool: True if file should be excluded, False otherwise
     """
     try:
+        if compiled_patterns is None:
+            compiled_patterns = compile_exclude_patterns(exclude_patterns)
+        substring_regex, wildcard_suffixes = compiled_patterns
+        
         # Get relative path for pattern matching
         relative_path = file_path.relative_to(base_path)
-        path_parts = relative_path.parts
-        file_name = file_path.name
-        
-        for pattern in exclude_patterns:
-            # Check if pattern matches any part of the path
-            if any(pattern in part for part in path_parts):
-                return True
-            
-            # Check if pattern matches the filename
-            if pattern in file_name:
-                return True
-            
-            # Check for wildcard patterns
-            if pattern.startswith('*.') and file_name.endswith(pattern[1:]):
-                return True
         
-        return False
+        # Check if any pattern occurs in any part of the path (including the filename)
+        if substring_regex is not None and any(substring_regex.search(part) for part in relative_path.parts):
+            return True
+        
+        # Check for wildcard patterns
+        return bool(wildcard_suffixes) and file_path.name.endswith(wildcard_suffixes)
         
     except Exception:
         return True  # Exclude if we can't determine
@@ -147,7 +210,7 @@ def has_valid_extension(file_path: Path, include_extensions: list) -> bool:
     
     Args:
         file_path: Path to the file
-        include_extensions: List of valid extensions
+        include_extensions: Valid extensions (pass a set or frozenset when checking many files)
         
     Returns:
         bool: True if file has valid extension, False otherwise
@@ -3,6 +3,14 @@
 
 from urllib.parse import urlparse
 from git import Repo
+from .file_utils import format_file_size
+
+# Common Git hosting services accepted over HTTP/HTTPS without a .git suffix
+VALID_HOSTS = (
+    'github.com', 'gitlab.com', 'bitbucket.org',
+    'git.sr.ht', 'codeberg.org', 'gitea.com',
+    'dev.azure.com', 'sourceforge.net'
+)
 
 
 def is_valid_repo_url(url: str) -> bool:
@@ -10,12 +18,14 @@ def is_valid_repo_url(url: str) -> bool:
     Validate if the URL is a valid Git repository URL
     
     Args:
-        url: Repository URL to validate
+        url: Repository URL to validate (surrounding whitespace is ignored)
         
     Returns:
         bool: True if valid, False otherwise
     """
     try:
+        url = url.strip()
+        
         # Check for SSH URLs (git@host:user/repo.git)
         if url.startswith('git@'):
             # SSH URL format: git@hostname:username/repository.git
@@ -30,17 +40,10 @@ def is_valid_repo_url(url: str) -> bool:
         if not parsed.scheme or not parsed.netloc:
             return False
         
-        # Support common Git hosting services
-        valid_hosts = [
-            'github.com', 'gitlab.com', 'bitbucket.org',
-            'git.sr.ht', 'codeberg.org', 'gitea.com',
-            'dev.azure.com', 'sourceforge.net'
-        ]
-        
         # Check for HTTPS/HTTP URLs
         if parsed.scheme in ['http', 'https']:
             # Check if it's from a known Git hosting service
-            if any(host in parsed.netloc for host in valid_hosts):
+            if any(host in parsed.netloc for host in VALID_HOSTS):
                 return True
             # Or if it ends with .git
             if url.endswith('.git'):
@@ -106,4 +109,29 @@ def get_repository_info(repo: Repo) -> dict:
             'author': 'unknown',
             'commit_date': 'unknown',
             'commit_message': 'unknown'
-        } 
\ No newline at end of file
+        } 
+
+
+def get_repository_object_size(repo: Repo) -> str:
+    """
+    Get the size of the repository's Git object store
+
+    Reads `git count-objects -v`, a single git command, rather than walking
+    and stat-ing every file in the working tree.
+
+    Args:
+        repo: GitPython Repo object
+
+    Returns:
+        str: Human-readable size of loose and packed objects
+    """
+    try:
+        counts = dict(
+            line.split(': ', 1)
+            for line in repo.git.count_objects('-v').splitlines()
+            if ': ' in line
+        )
+        size_kib = int(counts.get('size', 0)) + int(counts.get('size-pack', 0))
+        return format_file_size(size_kib * 1024)
+    except Exception:
+        return "Unknown size"
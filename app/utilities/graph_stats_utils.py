@@ -1,13 +1,39 @@
 # Code Graph - Graph Statistics Utilities
 # Utility functions for getting statistics about knowledge graphs and vector indexes
 
+import heapq
 import logging
+from operator import itemgetter
 from typing import Tuple, Dict, Any
-from neo4j import Driver
+from neo4j import Driver, Result, RoutingControl
+from app.config import Config
+from app.utilities.neo4j_utils import get_label_and_type_counts
 
 logger = logging.getLogger(__name__)
 
 
+def _vector_index_exists(driver: Driver) -> bool:
+    """
+    Check whether the CodeChunk vector index exists
+    
+    Args:
+        driver: Neo4j driver instance
+        
+    Returns:
+        bool: True if code_chunks_vector_index is present
+    """
+    try:
+        return driver.execute_query(
+            "SHOW INDEXES YIELD name WHERE name = 'code_chunks_vector_index' "
+            "RETURN count(*) > 0 AS index_exists",
+            database_=Config.NEO4J_DATABASE,
+            routing_=RoutingControl.READ,
+            result_transformer_=Result.single
+        )["index_exists"]
+    except Exception:
+        return False
+
+
 def get_graph_creation_stats(driver: Driver) -> Tuple[bool, str, Dict[str, Any]]:
     """
     Get statistics about the created knowledge graph
@@ -36,95 +62,66 @@ def get_vector_index_stats(driver: Driver) -> Tuple[bool, str]:
         Tuple[bool, str]: (success, message)
     """
     try:
-        with driver.session() as session:
-            # Count CodeChunk nodes (safely handle case where they don't exist)
-            try:
-                chunk_result = session.run("MATCH (c:CodeChunk) RETURN count(c) as chunk_count")
-                chunk_record = chunk_result.single()
-                chunk_count = chunk_record["chunk_count"] if chunk_record else 0
-            except Exception:
-                chunk_count = 0
-            
-            # Count File nodes
-            try:
-                file_result = session.run("MATCH (f:File) RETURN count(f) as file_count")
-                file_record = file_result.single()
-                file_count = file_record["file_count"] if file_record else 0
-            except Exception:
-                file_count = 0
-            
-            # Count CONTAINS_CHUNK relationships (safely handle case where they don't exist)
-            try:
-                rel_result = session.run("MATCH ()-[r:CONTAINS_CHUNK]->() RETURN count(r) as rel_count")
-                rel_record = rel_result.single()
-                rel_count = rel_record["rel_count"] if rel_record else 0
-            except Exception:
-                rel_count = 0
-            
-            # Check if vector index exists
-            try:
-                index_result = session.run("SHOW INDEXES YIELD name WHERE name = 'code_chunks_vector_index'")
-                index_exists = len(list(index_result)) > 0
-            except:
-                index_exists = False
-            
-            message = f"CodeChunks: {chunk_count}, Files: {file_count}, Links: {rel_count}, Index: {'✅' if index_exists else '❌'}"
-            return True, message
+        # Count CodeChunk nodes, File nodes and CONTAINS_CHUNK links in one round-trip
+        # (labeled counts are served from the count store and return 0 for missing labels)
+        try:
+            counts_query = """
+            CALL { MATCH (c:CodeChunk) RETURN count(c) AS chunk_count }
+            CALL { MATCH (f:File) RETURN count(f) AS file_count }
+            CALL { MATCH ()-[r:CONTAINS_CHUNK]->() RETURN count(r) AS rel_count }
+            RETURN chunk_count, file_count, rel_count
+            """
+            counts = driver.execute_query(
+                counts_query,
+                database_=Config.NEO4J_DATABASE,
+                routing_=RoutingControl.READ,
+                result_transformer_=Result.single
+            )
+            chunk_count = counts["chunk_count"]
+            file_count = counts["file_count"]
+            rel_count = counts["rel_count"]
+        except Exception:
+            chunk_count = file_count = rel_count = 0
+        
+        index_exists = _vector_index_exists(driver)
+        
+        message = f"CodeChunks: {chunk_count}, Files: {file_count}, Links: {rel_count}, Index: {'✅' if index_exists else '❌'}"
+        return True, message
             
     except Exception as e:
         return False, f"Error getting vector stats: {str(e)}"
 
 
-def get_graphrag_system_stats(driver: Driver) -> Tuple[bool, str]:
+def get_graphrag_system_stats(driver: Driver, use_apoc: bool = False) -> Tuple[bool, str]:
     """
     Get comprehensive statistics about the GraphRAG system
     
     Args:
         driver: Neo4j driver instance
+        use_apoc: Read label/type counts through apoc.meta.stats() (APOC must be installed)
         
     Returns:
         Tuple[bool, str]: (success, message)
     """
     try:
-        with driver.session() as session:
-            # Count all node types
-            node_query = """
-            MATCH (n)
-            RETURN labels(n)[0] as NodeType, count(n) as Count
-            ORDER BY Count DESC
-            """
-            
-            node_result = session.run(node_query)
-            node_counts = {record["NodeType"]: record["Count"] for record in node_result}
-            
-            # Count all relationship types
-            rel_query = """
-            MATCH ()-[r]->()
-            RETURN type(r) as RelType, count(r) as Count
-            ORDER BY Count DESC
-            """
-            
-            rel_result = session.run(rel_query)
-            rel_counts = {record["RelType"]: record["Count"] for record in rel_result}
-            
-            # Check vector index
-            try:
-                index_result = session.run("SHOW INDEXES YIELD name WHERE name = 'code_chunks_vector_index'")
-                vector_index_exists = len(list(index_result)) > 0
-            except:
-                vector_index_exists = False
-            
-            # Format statistics
-            node_summary = ", ".join([f"{k}: {v}" for k, v in list(node_counts.items())[:5]])
-            rel_summary = ", ".join([f"{k}: {v}" for k, v in list(rel_counts.items())[:5]])
-            
-            message = (
-                f"Nodes ({node_summary}), "
-                f"Relationships ({rel_summary}), "
-                f"Vector Index: {'✅' if vector_index_exists else '❌'}"
-            )
-            
-            return True, message
+        # Count node labels and relationship types from the count store
+        # rather than grouping over a scan of every node and relationship
+        node_counts, rel_counts = get_label_and_type_counts(driver, use_apoc)
+        
+        vector_index_exists = _vector_index_exists(driver)
+        
+        # Format statistics
+        # Only the five largest counts are shown, so select them without a full sort
+        node_summary = ", ".join(f"{k}: {v}" for k, v in heapq.nlargest(5, node_counts.items(), key=itemgetter(1)))
+        rel_summary = ", ".join(f"{k}: {v}" for k, v in heapq.nlargest(5, rel_counts.items(), key=itemgetter(1)))
+        
+        message = (
+            f"Nodes ({node_summary}), "
+            f"Relationships ({rel_summary}), "
+            f"Vector Index: {'✅' if vector_index_exists else '❌'}"
+        )
+        
+        return True, message
             
     except Exception as e:
         return False, f"Error getting system stats: {str(e)}" 
\ No newline at end of file
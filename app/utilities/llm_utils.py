@@ -3,10 +3,10 @@
 
 import logging
 from typing import List, Dict, Tuple
-from app.config import Config
+from app.config import get_config
 
 logger = logging.getLogger(__name__)
-config = Config()
+config = get_config()
 
 
 def prepare_context_for_llm(query: str, vector_results: List[Dict], graph_context: Dict) -> Dict:
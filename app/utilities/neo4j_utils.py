@@ -2,11 +2,40 @@
 # Neo4j database utility functions
 
 import logging
-from typing import Tuple, Dict, Any
-from neo4j import Driver
+from typing import Tuple, Dict, Any, List
+from neo4j import Driver, Result, RoutingControl
+from app.config import Config
 
 logger = logging.getLogger(__name__)
 
+# Seconds to wait for newly created lookup indexes to come online
+INDEX_AWAIT_TIMEOUT_SECONDS = 60
+
+
+def _read_query(driver: Driver, query: str, result_transformer, parameters: Dict[str, Any] = None):
+    """
+    Run a one-shot read query through driver.execute_query
+    
+    execute_query borrows a pooled connection inside a managed, retried read
+    transaction, so single-statement lookups skip the explicit session setup.
+    
+    Args:
+        driver: Neo4j driver instance
+        query: Cypher query to run
+        result_transformer: Callable applied to the Result (e.g. Result.single)
+        parameters: Optional query parameters
+        
+    Returns:
+        Whatever result_transformer returns
+    """
+    return driver.execute_query(
+        query,
+        parameters,
+        database_=Config.NEO4J_DATABASE,
+        routing_=RoutingControl.READ,
+        result_transformer_=result_transformer
+    )
+
 
 def check_neo4j_health(driver: Driver) -> Tuple[bool, str]:
     """
@@ -19,16 +48,14 @@ def check_neo4j_health(driver: Driver) -> Tuple[bool, str]:
         Tuple[bool, str]: (is_healthy, status_message)
     """
     try:
-        with driver.session() as session:
-            # Simple health check query
-            result = session.run("RETURN 'healthy' as status")
-            record = result.single()
-            
-            if record and record["status"] == "healthy":
-                return True, "✅ Neo4j is healthy and responsive"
-            else:
-                return False, "❌ Neo4j health check failed"
-                
+        # Simple health check query
+        record = _read_query(driver, "RETURN 'healthy' as status", Result.single)
+        
+        if record and record["status"] == "healthy":
+            return True, "✅ Neo4j is healthy and responsive"
+        else:
+            return False, "❌ Neo4j health check failed"
+        
     except Exception as e:
         return False, f"❌ Neo4j health check error: {str(e)}"
 
@@ -49,7 +76,7 @@ def clear_database(driver: Driver, confirm: bool = False) -> Tuple[bool, str]:
         return False, "❌ Database clear not confirmed. Set confirm=True to proceed."
     
     try:
-        with driver.session() as session:
+        with driver.session(database=Config.NEO4J_DATABASE) as session:
             # Get counts before deletion
             node_result = session.run("MATCH (n) RETURN count(n) as count")
             node_count = node_result.single()["count"]
@@ -77,6 +104,103 @@ def clear_database(driver: Driver, confirm: bool = False) -> Tuple[bool, str]:
         return False, error_msg
 
 
+def quote_identifier(name: str) -> str:
+    """
+    Backtick-quote a label or relationship type for interpolation into Cypher
+    
+    Embedded backticks are doubled, which is Cypher's escape inside a quoted
+    name, so the identifier keeps its exact spelling.
+    """
+    return "`" + str(name).replace("`", "``") + "`"
+
+
+def _run_count_union(driver: Driver, names: List[str], pattern: str) -> Dict[str, int]:
+    """
+    Count every label/type in one round-trip
+    
+    Each UNION ALL branch is a labeled (or typed) count, which the planner
+    answers from the count store instead of scanning the graph.
+    
+    Args:
+        driver: Neo4j driver instance
+        names: Labels or relationship types to count
+        pattern: MATCH pattern with a {name} placeholder binding ``x``
+        
+    Returns:
+        Dict[str, int]: Counts keyed by label/type
+    """
+    if not names:
+        return {}
+    
+    def counts_by_name(result: Result) -> Dict[str, int]:
+        return {record["name"]: record["count"] for record in result}
+    
+    branches = [
+        f"MATCH {pattern.format(name=quote_identifier(name))} RETURN $names[{i}] AS name, count(x) AS count"
+        for i, name in enumerate(names)
+    ]
+    return _read_query(driver, " UNION ALL ".join(branches), counts_by_name, {"names": names})
+
+
+def count_nodes_by_label(driver: Driver) -> Dict[str, int]:
+    """
+    Get node counts per label from the count store
+    
+    Args:
+        driver: Neo4j driver instance
+        
+    Returns:
+        Dict[str, int]: Node counts keyed by label
+    """
+    labels = _read_query(
+        driver, "CALL db.labels() YIELD label RETURN collect(label) AS labels", Result.single
+    )["labels"]
+    return _run_count_union(driver, labels, "(x:{name})")
+
+
+def count_relationships_by_type(driver: Driver) -> Dict[str, int]:
+    """
+    Get relationship counts per type from the count store
+    
+    Args:
+        driver: Neo4j driver instance
+        
+    Returns:
+        Dict[str, int]: Relationship counts keyed by type
+    """
+    rel_types = _read_query(
+        driver,
+        "CALL db.relationshipTypes() YIELD relationshipType RETURN collect(relationshipType) AS types",
+        Result.single
+    )["types"]
+    return _run_count_union(driver, rel_types, "()-[x:{name}]->()")
+
+
+def get_label_and_type_counts(driver: Driver, use_apoc: bool = False) -> Tuple[Dict[str, int], Dict[str, int]]:
+    """
+    Get node counts per label and relationship counts per type
+    
+    With APOC, both maps come from a single apoc.meta.stats() call; otherwise
+    each is answered by one UNION ALL of labeled count-store lookups.
+    
+    Args:
+        driver: Neo4j driver instance
+        use_apoc: Read the counts through apoc.meta.stats() (APOC must be installed)
+        
+    Returns:
+        Tuple[Dict, Dict]: (node counts by label, relationship counts by type)
+    """
+    if use_apoc:
+        stats = _read_query(
+            driver,
+            "CALL apoc.meta.stats() YIELD labels, relTypesCount RETURN labels, relTypesCount",
+            Result.single
+        )
+        return stats["labels"], stats["relTypesCount"]
+    
+    return count_nodes_by_label(driver), count_relationships_by_type(driver)
+
+
 def get_database_statistics(driver: Driver) -> Tuple[bool, str, Dict[str, Any]]:
     """
     Get comprehensive database statistics
@@ -90,46 +214,30 @@ def get_database_statistics(driver: Driver) -> Tuple[bool, str, Dict[str, Any]]:
     try:
         stats = {}
         
-        with driver.session() as session:
-            # Simple node count
-            node_result = session.run("MATCH (n) RETURN count(n) as total_nodes")
-            total_nodes = node_result.single()["total_nodes"]
-            stats["total_nodes"] = total_nodes
-            
-            # Simple relationship count
-            rel_result = session.run("MATCH ()-[r]->() RETURN count(r) as total_relationships")
-            total_relationships = rel_result.single()["total_relationships"]
-            stats["total_relationships"] = total_relationships
-            
-            # Try to get labels (fallback if not available)
-            try:
-                label_result = session.run("CALL db.labels() YIELD label RETURN collect(label) as labels")
-                labels = label_result.single()["labels"]
-                stats["node_labels"] = {label: 0 for label in labels}  # Placeholder counts
-                
-                # Get actual counts for each label
-                for label in labels:
-                    count_result = session.run(f"MATCH (n:{label}) RETURN count(n) as count")
-                    count = count_result.single()["count"]
-                    stats["node_labels"][label] = count
-                    
-            except Exception:
-                stats["node_labels"] = {"Unknown": total_nodes}
-            
-            # Try to get relationship types (fallback if not available)
-            try:
-                rel_type_result = session.run("CALL db.relationshipTypes() YIELD relationshipType RETURN collect(relationshipType) as types")
-                rel_types = rel_type_result.single()["types"]
-                stats["relationship_types"] = {rel_type: 0 for rel_type in rel_types}  # Placeholder counts
-                
-                # Get actual counts for each relationship type
-                for rel_type in rel_types:
-                    count_result = session.run(f"MATCH ()-[r:{rel_type}]->() RETURN count(r) as count")
-                    count = count_result.single()["count"]
-                    stats["relationship_types"][rel_type] = count
-                    
-            except Exception:
-                stats["relationship_types"] = {"Unknown": total_relationships}
+        # Node and relationship totals in one round-trip
+        totals = _read_query(
+            driver,
+            "CALL { MATCH (n) RETURN count(n) AS total_nodes } "
+            "CALL { MATCH ()-[r]->() RETURN count(r) AS total_relationships } "
+            "RETURN total_nodes, total_relationships",
+            Result.single
+        )
+        total_nodes = totals["total_nodes"]
+        total_relationships = totals["total_relationships"]
+        stats["total_nodes"] = total_nodes
+        stats["total_relationships"] = total_relationships
+        
+        # Try to get per-label counts (fallback if not available)
+        try:
+            stats["node_labels"] = count_nodes_by_label(driver)
+        except Exception:
+            stats["node_labels"] = {"Unknown": total_nodes}
+        
+        # Try to get per-type counts (fallback if not available)
+        try:
+            stats["relationship_types"] = count_relationships_by_type(driver)
+        except Exception:
+            stats["relationship_types"] = {"Unknown": total_relationships}
         
         success_message = (
             f"📊 Database Statistics:\n"
@@ -147,6 +255,38 @@ def get_database_statistics(driver: Driver) -> Tuple[bool, str, Dict[str, Any]]:
         return False, error_msg, {}
 
 
+def create_code_chunk_vector_index(session) -> bool:
+    """
+    Create the CodeChunk embedding vector index if it does not exist
+    
+    The index is created with quantization enabled so the HNSW graph keeps
+    compressed vectors in memory; servers older than Neo4j 5.23 reject that
+    option, in which case the index is created without it.
+    
+    Args:
+        session: Open Neo4j session
+        
+    Returns:
+        bool: True if the index exists or was created, False otherwise
+    """
+    index_config = "`vector.dimensions`: 3072, `vector.similarity_function`: 'cosine'"
+    quantized_config = index_config + ", `vector.quantization.enabled`: true"
+    
+    for config in (quantized_config, index_config):
+        try:
+            session.run(
+                "CREATE VECTOR INDEX code_chunks_vector_index IF NOT EXISTS "
+                "FOR (c:CodeChunk) ON (c.embedding) "
+                f"OPTIONS {{indexConfig: {{{config}}}}}"
+            ).consume()
+            return True
+        except Exception as e:
+            last_error = e
+    
+    logger.warning(f"Vector index creation warning: {last_error}")
+    return False
+
+
 def create_constraints_and_indexes(driver: Driver) -> Tuple[bool, str]:
     """
     Create useful constraints and indexes for the knowledge graph
@@ -161,7 +301,7 @@ def create_constraints_and_indexes(driver: Driver) -> Tuple[bool, str]:
         constraints_created = []
         indexes_created = []
         
-        with driver.session() as session:
+        with driver.session(database=Config.NEO4J_DATABASE) as session:
             # Create constraints for unique identifiers
             constraints = [
                 "CREATE CONSTRAINT file_path_unique IF NOT EXISTS FOR (f:File) REQUIRE f.path IS UNIQUE",
@@ -183,7 +323,15 @@ def create_constraints_and_indexes(driver: Driver) -> Tuple[bool, str]:
                 "CREATE INDEX file_name_index IF NOT EXISTS FOR (f:File) ON (f.name)",
                 "CREATE INDEX function_name_index IF NOT EXISTS FOR (fn:Function) ON (fn.name)",
                 "CREATE INDEX class_name_index IF NOT EXISTS FOR (c:Class) ON (c.name)",
-                "CREATE INDEX chunk_id_index IF NOT EXISTS FOR (ch:Chunk) ON (ch.chunk_id)"
+                "CREATE INDEX chunk_id_index IF NOT EXISTS FOR (ch:CodeChunk) ON (ch.chunk_id)",
+                "CREATE INDEX chunk_file_path_index IF NOT EXISTS FOR (ch:CodeChunk) ON (ch.file_path)",
+                "CREATE INDEX file_language_index IF NOT EXISTS FOR (f:File) ON (f.language)",
+                # Entity ids written by the knowledge graph MERGEs
+                "CREATE INDEX file_id_index IF NOT EXISTS FOR (n:File) ON (n.id)",
+                "CREATE INDEX function_id_index IF NOT EXISTS FOR (n:Function) ON (n.id)",
+                "CREATE INDEX class_id_index IF NOT EXISTS FOR (n:Class) ON (n.id)",
+                "CREATE INDEX module_id_index IF NOT EXISTS FOR (n:Module) ON (n.id)",
+                "CREATE INDEX package_id_index IF NOT EXISTS FOR (n:Package) ON (n.id)"
             ]
             
             for index in indexes:
@@ -194,6 +342,13 @@ def create_constraints_and_indexes(driver: Driver) -> Tuple[bool, str]:
                 except Exception as e:
                     if "already exists" not in str(e).lower():
                         logger.warning(f"Could not create index: {e}")
+            
+            # Indexes populate in the background; wait so the first bulk load's
+            # MATCH/MERGE lookups are planned as index seeks, not label scans
+            try:
+                session.run("CALL db.awaitIndexes($timeout)", timeout=INDEX_AWAIT_TIMEOUT_SECONDS).consume()
+            except Exception as e:
+                logger.warning(f"Indexes not online yet: {e}")
         
         success_message = (
             f"✅ Database schema setup completed!\n"
@@ -0,0 +1,119 @@
+# Code Graph - Core Configuration Tests
+# Tests for environment variable coercion and startup validation
+
+import importlib.util
+import pytest
+import logging
+from types import ModuleType
+
+import app.config
+
+logger = logging.getLogger(__name__)
+
+
+def load_config_module() -> ModuleType:
+    """
+    Execute app/config.py as a fresh module so it re-reads the environment
+
+    The copy is not registered in sys.modules, so modules that already
+    imported app.config keep the original Config.
+
+    Returns:
+        ModuleType: The freshly executed configuration module
+    """
+    spec = importlib.util.spec_from_file_location("config_under_test", app.config.__file__)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class TestConfigValidation:
+    """Test suite for settings coerced and validated when app.config is imported"""
+
+    def test_numeric_settings_are_coerced(self, monkeypatch):
+        """
+        Test that numeric settings are converted from their environment strings
+
+        Validates:
+        1. Integers and floats are parsed into their types
+        2. Empty values fall back to the defaults
+        """
+        monkeypatch.setenv("NEO4J_MAX_POOL_SIZE", "75")
+        monkeypatch.setenv("NEO4J_CONNECTION_TIMEOUT", "2.5")
+        monkeypatch.setenv("CHUNK_SIZE", "")
+        monkeypatch.setenv("CHUNK_OVERLAP", "")
+
+        config_module = load_config_module()
+
+        assert config_module.Config.NEO4J_MAX_POOL_SIZE == 75
+        assert config_module.Config.NEO4J_CONNECTION_TIMEOUT == 2.5
+        assert config_module.Config.CHUNK_SIZE == 500
+        assert config_module.Config.CHUNK_OVERLAP == 50
+
+        logger.info("✅ Numeric settings coercion test passed")
+
+    def test_malformed_integer_names_the_variable(self, monkeypatch):
+        """
+        Test that a non-numeric value fails at import with the variable's name
+        """
+        monkeypatch.setenv("NEO4J_MAX_POOL_SIZE", "fifty")
+
+        with pytest.raises(ValueError, match="Invalid value for NEO4J_MAX_POOL_SIZE: 'fifty'"):
+            load_config_module()
+
+        logger.info("✅ Malformed integer test passed")
+
+    @pytest.mark.parametrize("overlap", ["-1", "500", "600"])
+    def test_chunk_overlap_must_be_smaller_than_chunk_size(self, monkeypatch, overlap):
+        """
+        Test that CHUNK_OVERLAP outside 0..CHUNK_SIZE-1 fails at import
+        """
+        monkeypatch.setenv("CHUNK_SIZE", "500")
+        monkeypatch.setenv("CHUNK_OVERLAP", overlap)
+
+        with pytest.raises(ValueError, match=r"CHUNK_OVERLAP \(" + overlap + r"\)"):
+            load_config_module()
+
+        logger.info("✅ Chunk overlap validation test passed")
+
+    @pytest.mark.parametrize("batch_size", ["0", "2049"])
+    def test_embedding_batch_size_must_fit_one_request(self, monkeypatch, batch_size):
+        """
+        Test that EMBEDDING_BATCH_SIZE outside 1..2048 fails at import with the variable's name
+        """
+        monkeypatch.setenv("EMBEDDING_BATCH_SIZE", batch_size)
+
+        with pytest.raises(ValueError, match=r"EMBEDDING_BATCH_SIZE \(" + batch_size + r"\) must be between 1 and 2048"):
+            load_config_module()
+
+        logger.info("✅ Embedding batch size validation test passed")
+
+    @pytest.mark.parametrize("batch_size", ["1", "2048"])
+    def test_embedding_batch_size_accepts_limits(self, monkeypatch, batch_size):
+        """
+        Test that the smallest and largest allowed batch sizes load
+        """
+        monkeypatch.setenv("EMBEDDING_BATCH_SIZE", batch_size)
+
+        assert load_config_module().Config.EMBEDDING_BATCH_SIZE == int(batch_size)
+
+        logger.info("✅ Embedding batch size limits test passed")
+
+    def test_validate_config_reports_first_missing_variable(self, monkeypatch, capsys):
+        """
+        Test that validate_config returns a bool and names only the first missing variable
+
+        Validates:
+        1. Complete configuration validates as True
+        2. Missing variables return False and report the first one in REQUIRED_VARS order
+        """
+        for name in app.config.Config.REQUIRED_VARS:
+            monkeypatch.setenv(name, "set")
+        assert load_config_module().Config.validate_config() is True
+
+        monkeypatch.setenv("NEO4J_URI", "")
+        monkeypatch.setenv("NEO4J_PASSWORD", "")
+        assert load_config_module().Config.validate_config() is False
+        assert capsys.readouterr().out.strip() == "Missing required environment variable: NEO4J_URI"
+
+        logger.info("✅ Required configuration validation test passed")
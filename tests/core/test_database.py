@@ -3,9 +3,12 @@
 
 import pytest
 import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, Tuple
 from neo4j import Driver
 
+import app.database
 from app.database import (
     get_neo4j_connection, 
     initialize_database,
@@ -381,6 +384,36 @@ class TestDatabaseUtilities:
         logger.info(f"✅ Statistics utilities with data validated: {message}")
 
 
+class TestConnectionManager:
+    """Test suite for creating the shared connection manager"""
+    
+    def test_concurrent_first_use_creates_one_connection(self, monkeypatch):
+        """
+        Test that threads racing on first use all get the same connection manager
+        """
+        created = []
+        
+        class SlowConnection:
+            def __init__(self):
+                time.sleep(0.05)  # Widen the window in which other threads can race
+                created.append(self)
+            
+            def close(self):
+                pass
+        
+        monkeypatch.setattr(app.database, "_connection", None)
+        monkeypatch.setattr(app.database, "Neo4jConnection", SlowConnection)
+        monkeypatch.setattr(app.database.atexit, "register", lambda func: func)
+        
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            connections = list(executor.map(lambda _: get_neo4j_connection(), range(8)))
+        
+        assert len(created) == 1
+        assert all(connection is created[0] for connection in connections)
+        
+        logger.info("✅ Concurrent first use test passed")
+
+
 # Utility functions for testing
 def create_test_data(driver: Driver, node_count: int = 10) -> Dict[str, int]:
     """
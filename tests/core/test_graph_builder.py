@@ -1,13 +1,14 @@
 # Code Graph - Core Graph Builder Tests
 # Comprehensive tests for knowledge graph creation and vector indexing functionality
 
+import asyncio
 import pytest
 import logging
 from typing import List, Dict, Any, Tuple
 from unittest.mock import Mock, patch, MagicMock
 from pathlib import Path
 
-from app.graph_builder import GraphBuilder
+from app.graph_builder import GraphBuilder, TRANSACTION_BATCH_SIZE, _find_entity_mentions
 from app.ingestion import parse_code_chunks
 from tests.fixtures.java_patterns import get_test_data_manager
 
@@ -792,7 +793,268 @@ class TestGraphBuilderErrorHandling:
         logger.info("✅ Malformed document handling test passed")
 
 
+class TestGraphDocumentBatching:
+    """Test suite for grouping graph documents into UNWIND batches"""
+
+    def test_group_graph_documents_merges_duplicate_nodes(self):
+        """
+        Test grouping of LLMGraphTransformer output
+
+        Validates:
+        1. Nodes are grouped by label and deduplicated by id
+        2. Node properties from repeated mentions are merged
+        3. Relationships are grouped by (source label, type, target label)
+        """
+        user = Mock(id="User", type="Class", properties={"visibility": "public"})
+        user_again = Mock(id="User", type="Class", properties={"abstract": False})
+        save = Mock(id="save", type="Function", properties={})
+        contains = Mock(source=user, target=save, type="CONTAINS", properties={})
+
+        graph_documents = [
+            Mock(nodes=[user, save], relationships=[contains]),
+            Mock(nodes=[user_again], relationships=[]),
+        ]
+
+        node_groups, rel_groups = GraphBuilder._group_graph_documents(graph_documents)
+
+        assert set(node_groups) == {"Class", "Function"}
+        assert node_groups["Class"] == [
+            {"id": "User", "props": {"visibility": "public", "abstract": False}}
+        ]
+        assert rel_groups[("Class", "CONTAINS", "Function")] == [
+            {"src": "User", "dst": "save", "props": {}}
+        ]
+
+        logger.info("✅ Graph document grouping test passed")
+
+    def test_create_graphrag_system_checks_connection_once(self):
+        """
+        Test that the connection is validated in the calling thread, not by the concurrent workers
+        """
+        graph_builder = GraphBuilder()
+        graph_builder.connection = MagicMock()
+        documents = [create_mock_document("class A {}", chunk_id="c1")]
+
+        with patch.object(graph_builder, "ensure_connection", return_value=(True, "")) as ensure_connection, \
+                patch.object(graph_builder, "generate_knowledge_graph", return_value=(True, "KG done!")) as generate, \
+                patch.object(graph_builder, "create_vector_index", return_value=(True, "Index done!")) as create_index, \
+                patch.object(graph_builder, "_create_metadata_nodes", return_value=(True, "")), \
+                patch.object(graph_builder, "_create_bridge_relationships", return_value=(True, "")), \
+                patch.object(graph_builder, "_get_system_stats", return_value=(True, "")):
+            success, message = graph_builder.create_graphrag_system(documents)
+
+        assert success is True, message
+        ensure_connection.assert_called_once_with()
+        generate.assert_called_once_with(documents, check_connection=False)
+        create_index.assert_called_once_with(documents, create_metadata=False, check_connection=False)
+
+        logger.info("✅ Single connection check test passed")
+
+    def test_store_graph_groups_bounds_transaction_size(self):
+        """
+        Test that graphs below the bulk import threshold are still committed in slices
+
+        Validates:
+        1. A graph of one slice is written in a single transaction
+        2. A larger graph never puts more than TRANSACTION_BATCH_SIZE rows in one transaction
+        """
+        graph_builder = GraphBuilder()
+        graph_builder.config = Mock(NEO4J_DATABASE="neo4j")
+        graph_builder.connection = MagicMock()
+        session = graph_builder.driver.session.return_value.__enter__.return_value
+
+        def transaction_sizes():
+            return [
+                sum(map(len, call.args[1].values())) + sum(map(len, call.args[2].values()))
+                for call in session.execute_write.call_args_list
+            ]
+
+        small_rows = [{"id": f"C{i}", "props": {}} for i in range(10)]
+        graph_builder._store_graph_groups({"Class": small_rows}, {})
+        assert transaction_sizes() == [10]
+
+        session.execute_write.reset_mock()
+        node_rows = [{"id": f"C{i}", "props": {}} for i in range(TRANSACTION_BATCH_SIZE + 1)]
+        rel_rows = [{"src": f"C{i}", "dst": "save", "props": {}} for i in range(TRANSACTION_BATCH_SIZE + 1)]
+        graph_builder._store_graph_groups({"Class": node_rows}, {("Class", "CALLS", "Function"): rel_rows})
+
+        sizes = transaction_sizes()
+        assert sum(sizes) == 2 * (TRANSACTION_BATCH_SIZE + 1)
+        assert max(sizes) <= TRANSACTION_BATCH_SIZE
+        graph_builder.connection.has_apoc.assert_not_called()
+
+        logger.info("✅ Graph write transaction size test passed")
+
+    def test_write_graph_groups_escapes_backticks_in_names(self):
+        """
+        Test that labels and relationship types keep embedded backticks when quoted
+
+        Validates:
+        1. Backticks inside a label are doubled rather than dropped
+        2. Relationship types are quoted the same way
+        """
+        tx = MagicMock()
+        node_groups = {"Weird`Label": [{"id": "a", "props": {}}]}
+        rel_groups = {("Class", "USES`X", "Weird`Label"): [{"src": "a", "dst": "b", "props": {}}]}
+
+        GraphBuilder._write_graph_groups(tx, node_groups, rel_groups)
+
+        node_query, rel_query = [call.args[0] for call in tx.run.call_args_list]
+        assert "MERGE (n:`Weird``Label` {id: row.id})" in node_query
+        assert "MERGE (t:`Weird``Label` {id: row.dst})" in rel_query
+        assert "MERGE (s)-[r:`USES``X`]->(t)" in rel_query
+
+        logger.info("✅ Identifier quoting test passed")
+
+    def test_find_entity_mentions_pairs_chunks_with_entities(self):
+        """
+        Test client-side pairing of chunks with mentioned entities for bridge writes
+
+        Validates:
+        1. Chunks are paired with entities whose id appears in their text
+        2. Ids are also matched with the suffix stripped
+        3. An id that strips to an empty name is not matched against every chunk
+        """
+        documents = [
+            create_mock_document("UserService svc = new UserService();", chunk_id="c1"),
+            create_mock_document("order.save();", chunk_id="c2"),
+        ]
+
+        class_rows = _find_entity_mentions(documents, ["UserService", "Class"], "Class")
+        function_rows = _find_entity_mentions(documents, ["save()", "delete()"], "()")
+
+        assert class_rows == [{"chunk_id": "c1", "entity_id": "UserService"}]
+        assert function_rows == [{"chunk_id": "c2", "entity_id": "save()"}]
+
+        logger.info("✅ Entity mention pairing test passed")
+
+    def test_embed_with_cache_skips_cached_texts(self, tmp_path):
+        """
+        Test that only uncached chunk texts are sent to the embeddings API
+
+        Validates:
+        1. A first run embeds every distinct text once
+        2. A second run serves repeated texts from the cache
+        3. Results keep input order, and vectors round-trip as float32
+        """
+        graph_builder = GraphBuilder()
+        graph_builder.config = Mock(EMBEDDING_CACHE_PATH=str(tmp_path / "embeddings.sqlite3"))
+        embeddings = Mock(model="text-embedding-3-large")
+
+        with patch.object(graph_builder, "_embed_texts",
+                          side_effect=lambda _, texts, loop: [[float(len(t)), 0.5] for t in texts]) as embed_texts:
+            first = graph_builder._embed_with_cache(embeddings, ["ab", "abc", "ab"], Mock())
+            second = graph_builder._embed_with_cache(embeddings, ["abc", "abcd"], Mock())
+
+        assert embed_texts.call_args_list[0].args[1] == ["ab", "abc"]
+        assert embed_texts.call_args_list[1].args[1] == ["abcd"]
+        assert first == [[2.0, 0.5], [3.0, 0.5], [2.0, 0.5]]
+        assert second == [[3.0, 0.5], [4.0, 0.5]]
+
+        logger.info("✅ Embedding cache test passed")
+
+    def test_embed_with_cache_unusable_path_falls_back(self, tmp_path):
+        """
+        Test that an EMBEDDING_CACHE_PATH that cannot be created still returns embeddings
+        """
+        not_a_directory = tmp_path / "cache_file"
+        not_a_directory.write_text("not a directory")
+        graph_builder = GraphBuilder()
+        graph_builder.config = Mock(EMBEDDING_CACHE_PATH=str(not_a_directory / "embeddings.sqlite3"))
+        embeddings = Mock(model="text-embedding-3-large")
+
+        with patch.object(graph_builder, "_embed_texts",
+                          side_effect=lambda _, texts, loop: [[float(len(t))] for t in texts]) as embed_texts:
+            vectors = graph_builder._embed_with_cache(embeddings, ["ab", "abc", "ab"], Mock())
+
+        assert embed_texts.call_args.args[1] == ["ab", "abc"]
+        assert vectors == [[2.0], [3.0], [2.0]]
+
+        logger.info("✅ Embedding cache fallback test passed")
+
+    def test_embed_with_cache_disabled_still_deduplicates(self):
+        """
+        Test that identical chunk texts are embedded once without a cache
+        """
+        graph_builder = GraphBuilder()
+        graph_builder.config = Mock(EMBEDDING_CACHE_PATH="")
+        embeddings = Mock(model="text-embedding-3-large")
+        loop = Mock()
+
+        with patch.object(graph_builder, "_embed_texts",
+                          side_effect=lambda _, texts, loop: [[float(len(t))] for t in texts]) as embed_texts:
+            vectors = graph_builder._embed_with_cache(embeddings, ["header", "body!", "header"], loop)
+
+        embed_texts.assert_called_once_with(embeddings, ["header", "body!"], loop)
+        assert vectors == [[6.0], [5.0], [6.0]]
+
+        logger.info("✅ Embedding deduplication test passed")
+
+    def test_create_vector_index_embeds_all_slices_on_one_loop(self):
+        """
+        Test that every slice of a build is embedded through the async path on one event loop
+
+        Validates:
+        1. Documents spanning several TRANSACTION_BATCH_SIZE slices are all embedded
+        2. A client bound to its first event loop (like the OpenAI async pool) keeps working
+        3. A second build on the same builder gets a fresh client
+        """
+        graph_builder = GraphBuilder()
+        graph_builder.config = Mock(
+            EMBEDDING_CACHE_PATH="",
+            EMBEDDING_BATCH_SIZE=2048,
+            EMBEDDING_MAX_CONCURRENCY=4,
+            NEO4J_DATABASE="neo4j"
+        )
+        graph_builder.connection = MagicMock()
+        clients = []
+
+        def create_client():
+            clients.append(LoopBoundEmbeddings())
+            return clients[-1]
+
+        documents = [
+            create_mock_document(f"class C{i} {{}}", chunk_id=f"chunk_{i}")
+            for i in range(TRANSACTION_BATCH_SIZE + 1)
+        ]
+
+        with patch.object(graph_builder, "ensure_connection", return_value=(True, "")), \
+                patch.object(graph_builder, "_create_embeddings", side_effect=create_client):
+            for _ in range(2):
+                success, message = graph_builder.create_vector_index(documents)
+                assert success is True, message
+
+        assert len(clients) == 2
+        for client in clients:
+            assert client.texts_embedded == len(documents)
+            assert client.requests > 1
+
+        logger.info("✅ Single event loop embedding test passed")
+
+
 # Helper functions for test data management
+class LoopBoundEmbeddings:
+    """Fake async embeddings client that, like an httpx pool, only works on its first event loop"""
+
+    model = "text-embedding-3-large"
+
+    def __init__(self):
+        self.loop = None
+        self.requests = 0
+        self.texts_embedded = 0
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        loop = asyncio.get_running_loop()
+        if self.loop is None:
+            self.loop = loop
+        elif loop is not self.loop or self.loop.is_closed():
+            raise RuntimeError("Event loop is closed or client is attached to a different loop")
+        await asyncio.sleep(0)
+        self.requests += 1
+        self.texts_embedded += len(texts)
+        return [[float(len(text))] for text in texts]
+
+
 def create_mock_document(content: str, file_path: str = "test.java", chunk_id: str = "test_chunk") -> Mock:
     """Create a mock document for testing"""
     doc = Mock()
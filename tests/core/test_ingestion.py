@@ -6,7 +6,10 @@ import logging
 from typing import List, Dict, Any
 from pathlib import Path
 
-from app.ingestion import parse_code_chunks
+from git import Repo
+
+from app.ingestion import SPARSE_CHECKOUT_PATTERNS, _iter_code_files, discover_code_files, parse_code_chunks
+from app.utilities import compile_exclude_patterns, has_binary_prefix, is_valid_repo_url, should_exclude_file
 from tests.fixtures.test_data_manager import get_self_contained_test_manager
 
 logger = logging.getLogger(__name__)
@@ -363,7 +366,235 @@ class TestCodeIngestion:
             assert content_stats['contains_java_keywords'] >= content_stats['total_documents'] * 0.5, "At least 50% should contain Java keywords"
 
 
+class TestFileDiscovery:
+    """Test suite for cloning and file discovery helpers"""
+    
+    def test_sparse_checkout_patterns_ignore_extension_case(self, tmp_path):
+        """
+        Test that the sparse checkout keeps code files whatever the case of their extension
+        
+        Validates:
+        1. Upper-case extensions (Foo.PY, App.JS) are checked out, as discovery accepts them
+        2. Extensionless build files (Makefile) are checked out
+        3. Non-code files are left out of the working tree
+        """
+        source = tmp_path / "source"
+        (source / "web").mkdir(parents=True)
+        file_names = ["Foo.PY", "web/App.JS", "main.py", "Makefile", "logo.PNG"]
+        for file_name in file_names:
+            (source / file_name).write_text("content\n")
+        
+        source_repo = Repo.init(source)
+        source_repo.index.add(file_names)
+        source_repo.index.commit("Initial commit")
+        
+        clone = Repo.clone_from(source.as_uri(), tmp_path / "clone", multi_options=["--no-checkout"])
+        clone.git.sparse_checkout("set", "--no-cone", *SPARSE_CHECKOUT_PATTERNS)
+        clone.git.checkout()
+        
+        checked_out = {
+            path.relative_to(tmp_path / "clone").as_posix()
+            for path in (tmp_path / "clone").rglob("*")
+            if path.is_file() and ".git" not in path.parts
+        }
+        assert checked_out == {"Foo.PY", "web/App.JS", "main.py", "Makefile"}
+    
+    def test_discover_code_files_counts_lines_like_splitlines(self, tmp_path):
+        """
+        Test that line counts follow str.splitlines for every kind of line break
+        
+        Validates:
+        1. LF, CRLF and a missing trailing newline are counted as lines
+        2. Form feeds, vertical tabs and Unicode line separators also end a line
+        """
+        contents = {
+            "lf.py": "a = 1\nb = 2\n",
+            "crlf.py": "a = 1\r\nb = 2",
+            "form_feed.py": "a = 1\fb = 2\vc = 3\n",
+            "separators.py": "a = 1\u2028b = 2\u2029c = 3",
+            "empty.py": "",
+        }
+        for file_name, content in contents.items():
+            (tmp_path / file_name).write_text(content, encoding="utf-8", newline="")
+        
+        success, message, file_data_list = discover_code_files(str(tmp_path), include_extensions=[".py"])
+        
+        assert success, message
+        line_counts = {file_data["name"]: file_data["lines"] for file_data in file_data_list}
+        assert line_counts == {
+            "lf.py": 2,
+            "crlf.py": 2,
+            "form_feed.py": 3,
+            "separators.py": 3,
+            "empty.py": 0,
+        }
+    
+    def test_exclude_patterns_match_names_and_wildcard_suffixes(self, tmp_path):
+        """
+        Test discovery against substring and '*.ext' exclude patterns
+        
+        Validates:
+        1. A substring pattern excludes files whose name or directory contains it
+        2. A '*.ext' pattern excludes files by suffix only
+        3. Precompiled and uncompiled should_exclude_file calls agree
+        """
+        file_names = [
+            "src/app.py",
+            "src/catalog.py",
+            "src/run.log",
+            "src/secret_keys.py",
+            "secret/config.py",
+            "docs/notes.txt",
+        ]
+        create_file_tree(tmp_path, {file_name: "content\n" for file_name in file_names})
+        exclude_patterns = ["*.log", "secret"]
+        
+        success, message, file_data_list = discover_code_files(
+            str(tmp_path), include_extensions=[".py", ".log", ".txt"], exclude_patterns=exclude_patterns
+        )
+        
+        assert success, message
+        assert [file_data["relative_path"] for file_data in file_data_list] == [
+            str(Path("docs/notes.txt")),
+            str(Path("src/app.py")),
+            str(Path("src/catalog.py")),
+        ]
+        
+        compiled_patterns = compile_exclude_patterns(exclude_patterns)
+        for file_name in file_names:
+            file_path = tmp_path / file_name
+            assert should_exclude_file(file_path, tmp_path, exclude_patterns) == \
+                should_exclude_file(file_path, tmp_path, exclude_patterns, compiled_patterns)
+    
+    def test_discovery_skips_symlinked_directories(self, tmp_path):
+        """
+        Test that the scandir walk treats symlinks like Path.rglob did
+        
+        Validates:
+        1. Symlinked directories are not descended into (no duplicates or cycles)
+        2. Symlinks to files are discovered
+        3. Files come back in relative path order
+        """
+        create_file_tree(tmp_path, {"real/module.py": "x = 1\n", "real/nested/util.py": "y = 2\n"})
+        try:
+            (tmp_path / "linked").symlink_to(tmp_path / "real", target_is_directory=True)
+            (tmp_path / "loop").symlink_to(tmp_path, target_is_directory=True)
+            (tmp_path / "alias.py").symlink_to(tmp_path / "real" / "module.py")
+        except (OSError, NotImplementedError):
+            pytest.skip("Symlinks are not supported on this platform")
+        
+        success, message, file_data_list = discover_code_files(str(tmp_path), include_extensions=[".py"])
+        
+        assert success, message
+        assert [file_data["relative_path"] for file_data in file_data_list] == [
+            "alias.py",
+            str(Path("real/module.py")),
+            str(Path("real/nested/util.py")),
+        ]
+        assert file_data_list[0]["content"] == "x = 1\n"
+    
+    def test_discovery_prunes_excluded_directories(self, tmp_path):
+        """
+        Test that excluded directories are pruned from the walk
+        
+        Validates:
+        1. Files under excluded directories (node_modules, .git, build) are not returned
+        2. Pruned directories are never listed, so their files are not counted as found
+        3. Files in other directories are still discovered
+        """
+        create_file_tree(tmp_path, {
+            "src/main.py": "print('main')\n",
+            "src/utils/helpers.py": "def helper():\n    pass\n",
+            "node_modules/lib/index.js": "module.exports = {};\n",
+            ".git/hooks/pre-commit.sh": "exit 0\n",
+            "build/generated.py": "x = 1\n",
+        })
+        
+        stats = {}
+        file_data_list = list(_iter_code_files(tmp_path, stats=stats))
+        
+        assert [file_data["relative_path"] for file_data in file_data_list] == [
+            str(Path("src/main.py")),
+            str(Path("src/utils/helpers.py")),
+        ]
+        assert stats["files_found"] == 2
+    
+    def test_discovery_skips_binary_prefix_but_reads_utf16_text(self, tmp_path):
+        """
+        Test the 8KB binary prefix check
+        
+        Validates:
+        1. A file with NUL bytes near its start is skipped
+        2. A UTF-16 file with a byte order mark (whose text contains NULs) is read
+        3. Plain text files are unaffected
+        """
+        utf16_source = "class Greeter:\n    pass\n"
+        create_file_tree(tmp_path, {
+            "plain.py": "x = 1\n",
+            "packed.py": b"\x00\x01\x02\x03" + b"x = 1\n" * 100,
+            "wide.py": utf16_source.encode("utf-16"),
+        })
+        
+        assert has_binary_prefix(tmp_path / "packed.py") is True
+        assert has_binary_prefix(tmp_path / "wide.py") is False
+        
+        success, message, file_data_list = discover_code_files(str(tmp_path), include_extensions=[".py"])
+        
+        assert success, message
+        contents = {file_data["name"]: file_data["content"] for file_data in file_data_list}
+        assert contents == {"plain.py": "x = 1\n", "wide.py": utf16_source}
+
+
+class TestRepositoryUrlValidation:
+    """Test suite for repository URL validation before cloning"""
+    
+    @pytest.mark.parametrize("url", [
+        "git@github.com:user/repo.git",
+        "git@git.internal.example:team/repo",
+        "https://github.com/user/repo",
+        "http://gitlab.com/group/project",
+        "HTTPS://bitbucket.org/team/repo",
+        "https://git.example.com/team/repo.git",
+        "https://[::1]/team/repo.git",
+        "  https://github.com/user/repo\n",
+    ])
+    def test_accepts_repository_urls(self, url):
+        """SSH URLs, known hosts and any HTTP(S) URL ending in .git are accepted"""
+        assert is_valid_repo_url(url) is True
+    
+    @pytest.mark.parametrize("url", [
+        "git@github.com",
+        "git@github.com:repo.git",
+        "ftp://github.com/user/repo",
+        "https://example.com/user/repo",
+        "https:///user/repo.git",
+        "github.com/user/repo",
+        "",
+        None,
+    ])
+    def test_rejects_invalid_urls(self, url):
+        """Unknown hosts without .git, other schemes and malformed input are rejected"""
+        assert is_valid_repo_url(url) is False
+
+
 # Additional utility functions for testing
+def create_file_tree(root: Path, files: Dict[str, Any]) -> None:
+    """
+    Create files below root from a {relative path: str or bytes content} mapping
+    
+    Args:
+        root: Directory to create the files in
+        files: File contents keyed by relative path
+    """
+    for relative_path, content in files.items():
+        file_path = root / relative_path
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        if isinstance(content, bytes):
+            file_path.write_bytes(content)
+        else:
+            file_path.write_text(content, encoding="utf-8")
+
+
 def validate_document_structure(documents: List[Any]) -> bool:
     """
     Utility function to validate document structure